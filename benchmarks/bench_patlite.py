@@ -0,0 +1,260 @@
+"""Throughput/latency benchmark for the Patlite send path.
+
+Drives PatliteDevice the way the light/select/switch entities do, against
+in-process fake towers, and reports per scenario:
+
+  * frames/s actually received by the towers and commands issued,
+  * end-to-end latency (command issued -> frame at the tower) percentiles,
+  * event-loop block time (lag of a 1 ms ticker),
+  * state-change events (callbacks the 12 entities per tower would get).
+
+Run from the repository root:
+
+    python -m benchmarks.bench_patlite --towers 1 10 100 --rounds 50
+    python -m benchmarks.bench_patlite --loss 0.05 --delay-ms 2 --json
+    python -m benchmarks.bench_patlite --hub   # all towers on one shared socket
+
+Only the integration's Home Assistant-free modules are imported, so this
+runs without a Home Assistant install.
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import importlib
+import json
+import sys
+import time
+import types
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+
+from .fake_tower import FakeTower, start_towers
+
+_PKG_DIR = Path(__file__).resolve().parent.parent / "custom_components" / "patlite"
+
+
+def _load_integration() -> types.ModuleType:
+    # Importing custom_components.patlite would run its __init__ (Home Assistant
+    # setup code); register the directory as a bare package instead.
+    if "patlite" not in sys.modules:
+        pkg = types.ModuleType("patlite")
+        pkg.__path__ = [str(_PKG_DIR)]
+        sys.modules["patlite"] = pkg
+    return importlib.import_module("patlite.device")
+
+
+_device_mod = _load_integration()
+PatliteDevice = _device_mod.PatliteDevice
+tier_key = _device_mod.tier_key
+KEY_FLASH = _device_mod.KEY_FLASH
+KEY_BUZZER = _device_mod.KEY_BUZZER
+NUM_TIERS = importlib.import_module("patlite.const").NUM_TIERS
+PnsUdpHub = importlib.import_module("patlite.hub").PnsUdpHub
+
+# What the entities subscribe to: 5 lights + 5 selects on tier keys, flash, buzzer
+ENTITY_KEYS = [tier_key(i) for i in range(NUM_TIERS)] * 2 + [KEY_FLASH, KEY_BUZZER]
+
+
+def _percentile(values: list[float], pct: float) -> float | None:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+class LoopLagMonitor:
+    """Measure how late a 1 ms ticker wakes up: a proxy for event-loop block time."""
+
+    def __init__(self, interval: float = 0.001):
+        self.interval = interval
+        self.lags: list[float] = []
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+    async def _run(self) -> None:
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.lags.append(max(0.0, time.perf_counter() - start - self.interval))
+
+
+# ---------- Entity-equivalent actions ----------
+async def _select_option(device: PatliteDevice, tier: int, code: int) -> int:
+    # PatliteTierSelect.async_select_option
+    await device.async_set_tier_color(tier, code)
+    await device.async_set_tier_power(tier, True)
+    return 1
+
+
+async def tier_change(device: PatliteDevice, rnd: int) -> int:
+    """One select change per tower per round."""
+    return await _select_option(device, rnd % NUM_TIERS, 1 + rnd % 9)
+
+
+async def scene_burst(device: PatliteDevice, rnd: int) -> int:
+    """A scene: 5 selects + flash + buzzer switch, all fired concurrently."""
+    calls = [_select_option(device, tier, 1 + (rnd + tier) % 9) for tier in range(NUM_TIERS)]
+    calls.append(device.async_set_flash(rnd % 2))
+    calls.append(device.async_set_buzzer(1 + rnd % 11))
+    await asyncio.gather(*calls)
+    return len(calls)
+
+
+SCENARIOS: dict[str, Callable[[PatliteDevice, int], Awaitable[int]]] = {
+    "tier_change": tier_change,
+    "scene_burst": scene_burst,
+}
+
+
+async def _wait_delivered(pending: list[tuple[FakeTower, bytes]], timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if all(frame in tower.arrivals for tower, frame in pending):
+            return
+        await asyncio.sleep(0.001)
+
+
+async def run_scenario(
+    name: str, count: int, rounds: int, coalesce_ms: int, tower_opts: dict[str, Any], hub: bool = False
+) -> dict[str, Any]:
+    towers = await start_towers(count, **tower_opts)
+    shared = PnsUdpHub() if hub else None
+    devices = [
+        PatliteDevice(
+            "127.0.0.1",
+            t.port,
+            transport=shared.endpoint("127.0.0.1", t.port) if shared else None,
+            coalesce_ms=coalesce_ms,
+        )
+        for t in towers
+    ]
+    for device in devices:
+        await device.async_connect()
+
+    events = 0
+
+    def _on_event() -> None:
+        nonlocal events
+        events += 1
+
+    for device in devices:
+        for key in ENTITY_KEYS:
+            device.add_listener(_on_event, key)
+
+    action = SCENARIOS[name]
+    latencies: list[float] = []
+    commands = 0
+    monitor = LoopLagMonitor()
+    monitor.start()
+    started = time.monotonic()
+    for rnd in range(rounds):
+        for tower in towers:
+            tower.arrivals.clear()
+        issued = time.monotonic()
+        results = await asyncio.gather(*(action(d, rnd) for d in devices))
+        commands += sum(results)
+        pending = [(t, d._build_packet()) for t, d in zip(towers, devices)]
+        await _wait_delivered(pending, timeout=5.0)
+        latencies.extend(
+            (t.arrivals[frame] - issued) * 1000 for t, frame in pending if frame in t.arrivals
+        )
+    elapsed = time.monotonic() - started
+    await monitor.stop()
+
+    frames = sum(t.frames for t in towers)
+    stats = [d.stats for d in devices]
+    for device in devices:
+        device.close()
+    for tower in towers:
+        tower.close()
+
+    lags_ms = [lag * 1000 for lag in monitor.lags]
+    return {
+        "scenario": name,
+        "towers": count,
+        "rounds": rounds,
+        "commands": commands,
+        "frames": frames,
+        "commands_per_frame": round(commands / frames, 2) if frames else None,
+        "frames_per_s": round(frames / elapsed, 1),
+        "latency_ms": {
+            "p50": _round(_percentile(latencies, 50)),
+            "p95": _round(_percentile(latencies, 95)),
+            "p99": _round(_percentile(latencies, 99)),
+            "max": _round(max(latencies) if latencies else None),
+            "lost": count * rounds - len(latencies),
+        },
+        "loop_lag_ms": {"p99": _round(_percentile(lags_ms, 99)), "max": _round(max(lags_ms, default=None))},
+        "state_events": events,
+        "acked": sum(s.acked for s in stats),
+        "retried": sum(s.retried for s in stats),
+        "timed_out": sum(s.timed_out for s in stats),
+    }
+
+
+def _round(value: float | None) -> float | None:
+    return round(value, 3) if value is not None else None
+
+
+def _print_table(results: list[dict[str, Any]]) -> None:
+    header = (
+        f"{'scenario':<12} {'towers':>6} {'cmds':>7} {'frames':>7} {'frames/s':>9} "
+        f"{'p50 ms':>8} {'p99 ms':>8} {'lag max':>8} {'events':>7} {'retry':>6} {'t/o':>4}"
+    )
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        lat = r["latency_ms"]
+        print(
+            f"{r['scenario']:<12} {r['towers']:>6} {r['commands']:>7} {r['frames']:>7} "
+            f"{r['frames_per_s']:>9} {lat['p50']!s:>8} {lat['p99']!s:>8} "
+            f"{r['loop_lag_ms']['max']!s:>8} {r['state_events']:>7} {r['retried']:>6} {r['timed_out']:>4}"
+        )
+
+
+async def _main(args: argparse.Namespace) -> list[dict[str, Any]]:
+    tower_opts = {
+        "loss": args.loss,
+        "nak": args.nak,
+        "delay": args.delay_ms / 1000,
+    }
+    results = []
+    for name in args.scenarios:
+        for count in args.towers:
+            results.append(
+                await run_scenario(name, count, args.rounds, args.coalesce_ms, tower_opts, hub=args.hub)
+            )
+    return results
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--towers", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--rounds", type=int, default=50)
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--coalesce-ms", type=int, default=10)
+    parser.add_argument("--loss", type=float, default=0.0, help="request drop probability")
+    parser.add_argument("--nak", type=float, default=0.0, help="NAK probability")
+    parser.add_argument("--delay-ms", type=float, default=0.0, help="tower reply delay")
+    parser.add_argument("--hub", action="store_true", help="send through one shared UDP socket")
+    parser.add_argument("--json", action="store_true", help="print JSON instead of a table")
+    args = parser.parse_args(argv)
+
+    results = asyncio.run(_main(args))
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        _print_table(results)
+
+
+if __name__ == "__main__":
+    main()
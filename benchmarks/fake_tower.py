@@ -0,0 +1,78 @@
+"""In-process stand-in for a Patlite tower speaking PNS over UDP.
+
+Understands 'Detailed Motion Control' ('ABD', answers ACK/NAK) and status
+acquisition ('ABG', answers mode byte + 7 data bytes). Loss, NAK rate and
+reply delay are configurable so the send path can be exercised under a
+bad network.
+"""
+from __future__ import annotations
+import asyncio
+import random
+import time
+
+PNS_ACK = b"\x06"
+PNS_NAK = b"\x15"
+_CMD_CONTROL = 0x44  # 'D'
+_CMD_STATUS = 0x47  # 'G'
+
+
+class FakeTower(asyncio.DatagramProtocol):
+    def __init__(self, loss: float = 0.0, nak: float = 0.0, delay: float = 0.0, status: bool = True):
+        self.loss = loss  # probability that a request is dropped
+        self.nak = nak  # probability that a control frame is answered with NAK
+        self.delay = delay  # seconds before the reply is sent
+        self.status = status  # answer status reads (else NAK them)
+        self.state = bytearray(7)
+        self.frames = 0  # control frames received (dropped ones included)
+        self.status_reads = 0
+        self.arrivals: dict[bytes, float] = {}  # first arrival time per distinct frame
+        self._transport: asyncio.DatagramTransport | None = None
+
+    @property
+    def port(self) -> int:
+        return self._transport.get_extra_info("sockname")[1]
+
+    def connection_made(self, transport) -> None:
+        self._transport = transport
+
+    def datagram_received(self, data: bytes, addr) -> None:
+        now = time.monotonic()
+        if len(data) < 6 or data[:2] != b"AB":
+            return
+        if data[2] == _CMD_CONTROL:
+            self.frames += 1
+            self.arrivals.setdefault(bytes(data), now)
+        elif data[2] == _CMD_STATUS:
+            self.status_reads += 1
+        if self.loss and random.random() < self.loss:
+            return
+        reply = self._answer(data)
+        if self.delay:
+            asyncio.get_running_loop().call_later(self.delay, self._transport.sendto, reply, addr)
+        else:
+            self._transport.sendto(reply, addr)
+
+    def _answer(self, data: bytes) -> bytes:
+        if data[2] == _CMD_CONTROL and len(data) == 13:
+            if self.nak and random.random() < self.nak:
+                return PNS_NAK
+            self.state[:] = data[6:13]
+            return PNS_ACK
+        if data[2] == _CMD_STATUS and self.status:
+            return b"\x00" + bytes(self.state)
+        return PNS_NAK
+
+    def close(self) -> None:
+        if self._transport is not None:
+            self._transport.close()
+
+
+async def start_towers(count: int, **kwargs) -> list[FakeTower]:
+    loop = asyncio.get_running_loop()
+    towers = []
+    for _ in range(count):
+        _, tower = await loop.create_datagram_endpoint(
+            lambda: FakeTower(**kwargs), local_addr=("127.0.0.1", 0)
+        )
+        towers.append(tower)
+    return towers
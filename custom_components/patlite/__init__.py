@@ -1,44 +1,250 @@
 from __future__ import annotations
-from typing import Any
-import os, shutil
-from homeassistant.const import EVENT_HOMEASSISTANT_START
+import logging
+import random
+import time
+from typing import Final
+import voluptuous as vol
+
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
-from homeassistant.const import Platform
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP, Platform
+from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.helpers import config_validation as cv, device_registry as dr
+from homeassistant.helpers.typing import ConfigType
 
-from .const import DOMAIN
-from homeassistant.const import CONF_HOST, CONF_PORT
+from .const import (
+    DOMAIN,
+    CONF_COALESCE_MS,
+    DEFAULT_COALESCE_MS,
+    CONF_POLL_INTERVAL,
+    DEFAULT_POLL_INTERVAL_S,
+    ENTRY_TYPE_GROUP,
+    CONF_MEMBERS,
+    CONF_TRANSPORT,
+    TRANSPORT_TCP,
+    RESTORE_STAGGER_S,
+    CONF_RATE_LIMIT,
+    DEFAULT_RATE_LIMIT,
+    CONF_RATE_BURST,
+    DEFAULT_RATE_BURST,
+    CONF_GLOBAL_RATE_LIMIT,
+    CONF_GLOBAL_RATE_BURST,
+    DEFAULT_GLOBAL_RATE_BURST,
+    DATA_GLOBAL_LIMITER,
+    DATA_UDP_HUB,
+    DATA_POLL_SCHEDULER,
+    CONF_TRACE_FRAMES,
+    DEFAULT_TRACE_FRAMES,
+    CONF_TOWERS,
+    CONF_TOWERS_CSV,
+    CONF_AREA,
+    CONF_INGEST,
+    CONF_RULES,
+    CONF_SOURCES,
+    DATA_INGEST,
+)
+from homeassistant.const import CONF_HOST, CONF_PORT, CONF_NAME, CONF_TYPE
+from .assets import install_assets
 from .device import PatliteDevice
+from .group import PatliteGroup
+from .hub import PnsUdpHub
+from .ingest import INGEST_SCHEMA, IngestListener
+from .poller import PollScheduler, StatusPoller
+from .provision import TOWER_SCHEMA, async_provision, load_csv
+from .ratelimit import TokenBucket
+from .transport import PnsTcpTransport
+from .services import async_setup_services
+
+_LOGGER: Final = logging.getLogger(__name__)
 
 PLATFORMS: list[Platform] = [Platform.LIGHT, Platform.SELECT, Platform.SWITCH]
+# Groups send through their members, so only towers get the diagnostic sensors
+TOWER_PLATFORMS: list[Platform] = [*PLATFORMS, Platform.SENSOR]
+
+# Towers are set up from the UI or imported in bulk; other YAML keys are integration-wide
+CONFIG_SCHEMA = vol.Schema(
+    {
+        DOMAIN: vol.Schema({
+            vol.Optional(CONF_GLOBAL_RATE_LIMIT): vol.All(vol.Coerce(float), vol.Range(min=0)),
+            vol.Optional(CONF_GLOBAL_RATE_BURST, default=DEFAULT_GLOBAL_RATE_BURST): vol.All(
+                vol.Coerce(int), vol.Range(min=1)
+            ),
+            vol.Optional(CONF_TOWERS, default=[]): vol.All(cv.ensure_list, [TOWER_SCHEMA]),
+            vol.Optional(CONF_TOWERS_CSV): cv.string,
+            vol.Optional(CONF_INGEST): INGEST_SCHEMA,
+        })
+    },
+    extra=vol.ALLOW_EXTRA,
+)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    conf = config.get(DOMAIN, {})
+    if conf.get(CONF_GLOBAL_RATE_LIMIT):
+        # One bucket shared by every tower: caps the whole fleet's frame rate
+        hass.data[DATA_GLOBAL_LIMITER] = TokenBucket(
+            conf[CONF_GLOBAL_RATE_LIMIT], conf[CONF_GLOBAL_RATE_BURST]
+        )
+    # One UDP socket and one poll timer for the whole fleet
+    hass.data[DATA_UDP_HUB] = PnsUdpHub()
+    hass.data[DATA_POLL_SCHEDULER] = PollScheduler()
+    async_setup_services(hass)
+    if CONF_INGEST in conf:
+        await _async_start_ingest(hass, conf[CONF_INGEST])
+    if conf.get(CONF_TOWERS) or CONF_TOWERS_CSV in conf:
+        hass.async_create_background_task(_async_import_towers(hass, conf), f"{DOMAIN} tower import")
+    # Once per integration load, off the event loop and without holding up entry setup
+    hass.async_create_background_task(_async_install_assets(hass), f"{DOMAIN} asset install")
+    return True
+
+
+async def _async_start_ingest(hass: HomeAssistant, conf: ConfigType) -> None:
+    listener = IngestListener(hass, conf[CONF_RULES], conf[CONF_SOURCES])
+    try:
+        await listener.async_start(conf[CONF_HOST], conf[CONF_PORT])
+    except OSError as exc:
+        _LOGGER.error("Cannot listen for signals on %s:%s: %s", conf[CONF_HOST], conf[CONF_PORT], exc)
+        return
+    hass.data[DATA_INGEST] = listener
+
+    @callback
+    def _close(_event: Event) -> None:
+        listener.close()
+
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _close)
+
+
+async def _async_import_towers(hass: HomeAssistant, conf: ConfigType) -> None:
+    towers = list(conf.get(CONF_TOWERS, []))
+    if CONF_TOWERS_CSV in conf:
+        try:
+            towers += await hass.async_add_executor_job(load_csv, hass.config.path(conf[CONF_TOWERS_CSV]))
+        except OSError as exc:
+            _LOGGER.error("Could not read %s: %s", conf[CONF_TOWERS_CSV], exc)
+    await async_provision(hass, towers)
+
+
+async def _async_install_assets(hass: HomeAssistant) -> None:
+    start = time.perf_counter()
+    try:
+        written = await hass.async_add_executor_job(install_assets, hass.config.path("www"))
+    except OSError as exc:
+        _LOGGER.warning("Could not install dashboard assets: %s", exc)
+        return
+    _LOGGER.debug(
+        "Asset install took %.1f ms (written: %s)", (time.perf_counter() - start) * 1000, written or "none"
+    )
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    start = time.perf_counter()
+    if entry.data.get(CONF_TYPE) == ENTRY_TYPE_GROUP:
+        result = await _async_setup_group_entry(hass, entry)
+    else:
+        result = await _async_setup_tower_entry(hass, entry)
+    setup_ms = round((time.perf_counter() - start) * 1000, 2)
+    hass.data[DOMAIN][entry.entry_id]["setup_ms"] = setup_ms
+    _LOGGER.debug("Set up %s in %.2f ms", entry.title, setup_ms)
+    return result
+
+
+async def _async_setup_tower_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     host: str = entry.data[CONF_HOST]
     port: int = int(entry.data[CONF_PORT])
 
-    device = PatliteDevice(host, port)
+    if entry.data.get(CONF_TRANSPORT) == TRANSPORT_TCP:
+        transport = PnsTcpTransport(host, port)
+    else:
+        transport = hass.data[DATA_UDP_HUB].endpoint(host, port)
+    limiters = []
+    rate = float(entry.options.get(CONF_RATE_LIMIT, DEFAULT_RATE_LIMIT))
+    if rate > 0:
+        limiters.append(TokenBucket(rate, int(entry.options.get(CONF_RATE_BURST, DEFAULT_RATE_BURST))))
+    if DATA_GLOBAL_LIMITER in hass.data:
+        limiters.append(hass.data[DATA_GLOBAL_LIMITER])
+    device = PatliteDevice(
+        host,
+        port,
+        transport=transport,
+        coalesce_ms=int(entry.options.get(CONF_COALESCE_MS, DEFAULT_COALESCE_MS)),
+        limiters=limiters,
+        name=entry.data.get(CONF_NAME),
+    )
+    device.enable_trace(int(entry.options.get(CONF_TRACE_FRAMES, DEFAULT_TRACE_FRAMES)))
+    try:
+        await device.async_connect()
+    except OSError as exc:
+        raise ConfigEntryNotReady(f"Cannot connect to {host}:{port}: {exc}") from exc
 
     if DOMAIN not in hass.data:
         hass.data[DOMAIN] = {}
     hass.data[DOMAIN][entry.entry_id] = {"device": device}
+    # Groups derive their availability from the members
+    device.on_availability = lambda: _async_update_groups(hass)
+    _async_update_groups(hass)
+
+    poll_interval = float(entry.options.get(CONF_POLL_INTERVAL, DEFAULT_POLL_INTERVAL_S))
+    if poll_interval > 0:
+        poller = StatusPoller(device, hass.data[DATA_POLL_SCHEDULER], poll_interval)
+        poller.start()
+        hass.data[DOMAIN][entry.entry_id]["poller"] = poller
+
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
+
+    if CONF_AREA in entry.data:
+        # Registered before the entities so the device lands in its area on creation
+        dr.async_get(hass).async_get_or_create(
+            config_entry_id=entry.entry_id,
+            identifiers={(DOMAIN, device.uid)},
+            manufacturer="Patlite",
+            name=device.name,
+            model=device.model,
+            suggested_area=entry.data[CONF_AREA],
+        )
+
+    await hass.config_entries.async_forward_entry_setups(entry, TOWER_PLATFORMS)
+    # The entities have restored their pre-restart state by now: reconcile the
+    # tower with one frame, at a random point so a fleet does not send at once
+    device.schedule_restore_flush(random.uniform(0, RESTORE_STAGGER_S))
+    return True
 
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
-    src = os.path.join(os.path.dirname(__file__), "www/tower.gif")
-    dest_dir = os.path.join(hass.config.path("www"))
-    dest = os.path.join(dest_dir, "tower.gif")
-    if not os.path.exists(dest):
-        os.makedirs(dest_dir, exist_ok=True)
-        shutil.copyfile(src, dest)
 
+async def _async_setup_group_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    member_ids: list[str] = list(entry.data[CONF_MEMBERS])
+
+    def _members() -> list[PatliteDevice]:
+        loaded = hass.data.get(DOMAIN, {})
+        return [loaded[eid]["device"] for eid in member_ids if eid in loaded]
+
+    group = PatliteGroup(entry.entry_id, entry.data[CONF_NAME], _members)
+    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = {"device": group}
+    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     return True
 
 
+@callback
+def _async_update_groups(hass: HomeAssistant) -> None:
+    for data in hass.data.get(DOMAIN, {}).values():
+        if isinstance(data["device"], PatliteGroup):
+            data["device"].members_changed()
+
+
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Options changed: rebuild the device with the new settings."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
-    unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    platforms = PLATFORMS if entry.data.get(CONF_TYPE) == ENTRY_TYPE_GROUP else TOWER_PLATFORMS
+    unload_ok = await hass.config_entries.async_unload_platforms(entry, platforms)
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id, None)
+        data = hass.data[DOMAIN].pop(entry.entry_id, None)
+        if data:
+            if "poller" in data:
+                data["poller"].stop()
+            data["device"].close()
+            _async_update_groups(hass)
         if not hass.data[DOMAIN]:
             hass.data.pop(DOMAIN, None)
     return unload_ok
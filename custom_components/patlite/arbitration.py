@@ -0,0 +1,119 @@
+from __future__ import annotations
+import asyncio
+import itertools
+import logging
+import time
+from typing import Any, Final, Callable, Mapping
+
+from .const import NUM_TIERS
+
+_LOGGER: Final = logging.getLogger(__name__)
+
+# Slots in a resolved override list: tiers 0..NUM_TIERS-1, then flash, then buzzer
+FLASH_SLOT: Final = NUM_TIERS
+BUZZER_SLOT: Final = NUM_TIERS + 1
+
+_seq = itertools.count()
+
+
+class Claim:
+    """One source's wish for part of a tower, at a priority."""
+
+    __slots__ = ("source", "priority", "values", "expires", "seq")
+
+    def __init__(self, source: str, priority: int, values: dict[int, int], expires: float | None):
+        self.source = source
+        self.priority = priority
+        self.values = values  # slot -> value
+        self.expires = expires  # monotonic deadline, None = until released
+        self.seq = next(_seq)  # newer claim wins a priority tie
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "priority": self.priority,
+            "tiers": {slot + 1: v for slot, v in self.values.items() if slot < NUM_TIERS},
+            "flash": self.values.get(FLASH_SLOT),
+            "buzzer": self.values.get(BUZZER_SLOT),
+            "expires_in": round(self.expires - time.monotonic(), 1) if self.expires is not None else None,
+        }
+
+
+class ClaimArbiter:
+    """Resolve concurrent claims per tier, flash and buzzer by priority.
+
+    ``on_change`` is called whenever the resolved result may have changed
+    (claim added, replaced, released or expired).
+    """
+
+    def __init__(self, on_change: Callable[[], None]):
+        self._on_change = on_change
+        self._claims: dict[str, Claim] = {}
+        self._expiry_handle: asyncio.TimerHandle | None = None
+
+    @property
+    def claims(self) -> dict[str, Claim]:
+        return self._claims
+
+    def claim(
+        self,
+        source: str,
+        priority: int,
+        tiers: Mapping[int, int] | None = None,
+        flash: int | bool | None = None,
+        buzzer: int | None = None,
+        ttl: float | None = None,
+    ) -> None:
+        """Add or replace the claim held by ``source``."""
+        values: dict[int, int] = {int(t): int(c) for t, c in (tiers or {}).items()}
+        if flash is not None:
+            values[FLASH_SLOT] = 1 if flash else 0
+        if buzzer is not None:
+            values[BUZZER_SLOT] = int(buzzer)
+        expires = time.monotonic() + ttl if ttl else None
+        self._claims[source] = Claim(source, int(priority), values, expires)
+        self._schedule_expiry()
+        self._on_change()
+
+    def release(self, source: str) -> bool:
+        if self._claims.pop(source, None) is None:
+            return False
+        self._schedule_expiry()
+        self._on_change()
+        return True
+
+    def clear(self) -> None:
+        self._claims.clear()
+        if self._expiry_handle is not None:
+            self._expiry_handle.cancel()
+            self._expiry_handle = None
+
+    def resolve(self) -> list[int | None]:
+        """Winning value per slot, or None where no claim applies."""
+        resolved: list[int | None] = [None] * (NUM_TIERS + 2)
+        for claim in sorted(self._claims.values(), key=lambda c: (c.priority, c.seq), reverse=True):
+            for slot, value in claim.values.items():
+                if resolved[slot] is None:
+                    resolved[slot] = value
+        return resolved
+
+    def _schedule_expiry(self) -> None:
+        if self._expiry_handle is not None:
+            self._expiry_handle.cancel()
+            self._expiry_handle = None
+        deadlines = [c.expires for c in self._claims.values() if c.expires is not None]
+        if not deadlines:
+            return
+        loop = asyncio.get_running_loop()
+        delay = max(0.0, min(deadlines) - time.monotonic())
+        self._expiry_handle = loop.call_later(delay, self._expire)
+
+    def _expire(self) -> None:
+        self._expiry_handle = None
+        now = time.monotonic()
+        expired = [s for s, c in self._claims.items() if c.expires is not None and c.expires <= now]
+        for source in expired:
+            _LOGGER.debug("Claim %s expired", source)
+            del self._claims[source]
+        self._schedule_expiry()
+        if expired:
+            self._on_change()
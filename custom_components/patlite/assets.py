@@ -0,0 +1,60 @@
+from __future__ import annotations
+import hashlib
+import json
+import logging
+import os
+import shutil
+from typing import Final
+
+_LOGGER: Final = logging.getLogger(__name__)
+
+_ASSET_DIR: Final = os.path.join(os.path.dirname(__file__), "www")
+ASSETS: Final = ("tower.gif",)
+# Remembers the hash of what we last installed, so unchanged files are skipped
+# and a file the user replaced by hand is left alone.
+_STAMP_FILE: Final = ".patlite_assets.json"
+
+
+def _sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(65536), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def install_assets(www_dir: str) -> list[str]:
+    """Copy bundled dashboard assets into ``www_dir``. Blocking; run in an executor.
+
+    Returns the names of the files that were (re)written.
+    """
+    stamp_path = os.path.join(www_dir, _STAMP_FILE)
+    try:
+        with open(stamp_path, encoding="utf-8") as f:
+            stamps: dict[str, str] = json.load(f)
+    except (OSError, ValueError):
+        stamps = {}
+
+    written = []
+    for name in ASSETS:
+        src = os.path.join(_ASSET_DIR, name)
+        dest = os.path.join(www_dir, name)
+        src_hash = _sha256(src)
+        if os.path.exists(dest):
+            if stamps.get(name) == src_hash:
+                continue  # installed and unchanged
+            if name in stamps and _sha256(dest) != stamps[name]:
+                _LOGGER.debug("%s was replaced by the user; not overwriting", dest)
+                continue
+            if name not in stamps and _sha256(dest) != src_hash:
+                continue  # pre-existing file we did not install
+        os.makedirs(www_dir, exist_ok=True)
+        shutil.copyfile(src, dest)
+        written.append(name)
+        stamps[name] = src_hash
+
+    if written or not os.path.exists(stamp_path):
+        os.makedirs(www_dir, exist_ok=True)
+        with open(stamp_path, "w", encoding="utf-8") as f:
+            json.dump(stamps, f)
+    return written
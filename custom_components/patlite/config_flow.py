@@ -1,22 +1,134 @@
 from __future__ import annotations
+import ipaddress
 from typing import Any
 
 import voluptuous as vol
 
 from homeassistant import config_entries
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
-from homeassistant.const import CONF_HOST, CONF_PORT
+from homeassistant.const import CONF_HOST, CONF_PORT, CONF_NAME, CONF_TYPE
 from homeassistant.components.dhcp import DhcpServiceInfo
+from homeassistant.components.network import async_get_source_ip
+from homeassistant.helpers import config_validation as cv
 
-from .const import DOMAIN, UDP_PORT_DEFAULT
+from .const import (
+    DOMAIN,
+    UDP_PORT_DEFAULT,
+    CONF_TRANSPORT,
+    TRANSPORT_UDP,
+    TRANSPORT_TCP,
+    CONF_COALESCE_MS,
+    DEFAULT_COALESCE_MS,
+    CONF_POLL_INTERVAL,
+    DEFAULT_POLL_INTERVAL_S,
+    CONF_RATE_LIMIT,
+    DEFAULT_RATE_LIMIT,
+    CONF_RATE_BURST,
+    DEFAULT_RATE_BURST,
+    CONF_TRACE_FRAMES,
+    DEFAULT_TRACE_FRAMES,
+    ENTRY_TYPE_GROUP,
+    CONF_MEMBERS,
+    CONF_SUBNET,
+    CONF_HOSTS,
+    SCAN_MAX_HOSTS,
+    DATA_SCAN_CACHE,
+    CONF_AREA,
+)
+from .discovery import ScanCache, async_scan
 
 
 class PatliteConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     VERSION = 1
     _discovered: dict[str, Any] | None = None  # store pending DHCP discovery
+    _scan: dict[str, Any] | None = None  # port and hosts found by the last scan
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: config_entries.ConfigEntry) -> config_entries.OptionsFlow:
+        return PatliteOptionsFlow(config_entry)
+
+    @classmethod
+    @callback
+    def async_supports_options_flow(cls, config_entry: config_entries.ConfigEntry) -> bool:
+        # Coalescing/polling options only make sense for a physical tower
+        return config_entry.data.get(CONF_TYPE) != ENTRY_TYPE_GROUP
+
+    def _async_tower_entries(self) -> dict[str, str]:
+        return {
+            entry.entry_id: entry.title
+            for entry in self._async_current_entries()
+            if entry.data.get(CONF_TYPE) != ENTRY_TYPE_GROUP
+        }
+
+    def _async_configured_hosts(self) -> set[str]:
+        return {
+            entry.data[CONF_HOST]
+            for entry in self._async_current_entries()
+            if entry.data.get(CONF_TYPE) != ENTRY_TYPE_GROUP
+        }
 
     async def async_step_user(self, user_input: dict[str, Any] | None = None) -> FlowResult:
+        if user_input is None and not self._discovered:
+            # Offer a group only once there are towers to put in it
+            options = ["scan", "tower", "group"] if self._async_tower_entries() else ["scan", "tower"]
+            return self.async_show_menu(step_id="user", menu_options=options)
+        return await self.async_step_tower(user_input)
+
+    async def async_step_scan(self, user_input: dict[str, Any] | None = None) -> FlowResult:
+        """Probe a subnet for towers (static IPs never show up in DHCP discovery)."""
+        errors: dict[str, str] = {}
+        if user_input is not None:
+            try:
+                network = ipaddress.IPv4Network(user_input[CONF_SUBNET], strict=False)
+            except ValueError:
+                errors[CONF_SUBNET] = "invalid_subnet"
+            else:
+                if network.num_addresses > SCAN_MAX_HOSTS:
+                    errors[CONF_SUBNET] = "subnet_too_large"
+            if not errors:
+                port = int(user_input[CONF_PORT])
+                # Kept for the HA run, so scanning again only probes stale or new hosts
+                cache: ScanCache = self.hass.data.setdefault(DATA_SCAN_CACHE, {}).setdefault(port, ScanCache())
+                found = await async_scan(network, port, cache)
+                hosts = [h for h in found if h not in self._async_configured_hosts()]
+                if hosts:
+                    self._scan = {CONF_PORT: port, CONF_HOSTS: hosts}
+                    return await self.async_step_scan_select()
+                errors["base"] = "no_towers_found"
+
+        source_ip = await async_get_source_ip(self.hass)
+        default_subnet = str(ipaddress.IPv4Network(f"{source_ip}/24", strict=False)) if source_ip else ""
+        data_schema = vol.Schema({
+            vol.Required(CONF_SUBNET, default=default_subnet): str,
+            vol.Required(CONF_PORT, default=UDP_PORT_DEFAULT): int,
+        })
+        return self.async_show_form(step_id="scan", data_schema=data_schema, errors=errors)
+
+    async def async_step_scan_select(self, user_input: dict[str, Any] | None = None) -> FlowResult:
+        """Pick which of the found towers to add."""
+        hosts: list[str] = self._scan[CONF_HOSTS]
+        port: int = self._scan[CONF_PORT]
+        if user_input is not None and user_input[CONF_HOSTS]:
+            first, *rest = [h for h in hosts if h in user_input[CONF_HOSTS]]
+            # A flow creates one entry; the others go through the import step
+            for host in rest:
+                self.hass.async_create_task(
+                    self.hass.config_entries.flow.async_init(
+                        DOMAIN,
+                        context={"source": config_entries.SOURCE_IMPORT},
+                        data={CONF_HOST: host, CONF_PORT: port},
+                    )
+                )
+            return await self.async_step_tower({CONF_HOST: first, CONF_PORT: port})
+
+        data_schema = vol.Schema({
+            vol.Required(CONF_HOSTS, default=hosts): cv.multi_select({h: h for h in hosts}),
+        })
+        return self.async_show_form(step_id="scan_select", data_schema=data_schema)
+
+    async def async_step_tower(self, user_input: dict[str, Any] | None = None) -> FlowResult:
         if user_input is not None:
             # If we already set unique_id earlier (e.g., via DHCP), abort if configured
             await self.async_set_unique_id(user_input.get("mac") or self.unique_id or user_input[CONF_HOST])
@@ -24,8 +136,13 @@ class PatliteConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             data = {
                 CONF_HOST: user_input[CONF_HOST],
                 CONF_PORT: int(user_input.get(CONF_PORT, UDP_PORT_DEFAULT)),
+                CONF_TRANSPORT: user_input.get(CONF_TRANSPORT, TRANSPORT_UDP),
             }
-            return self.async_create_entry(title=f"Patlite {data[CONF_HOST]}", data=data)
+            # Name and area only come with a bulk import
+            for key in (CONF_NAME, CONF_AREA):
+                if user_input.get(key):
+                    data[key] = user_input[key]
+            return self.async_create_entry(title=data.get(CONF_NAME) or f"Patlite {data[CONF_HOST]}", data=data)
 
         # If we have a pending DHCP discovery, suggest its values
         defaults = {}
@@ -36,12 +153,37 @@ class PatliteConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         data_schema = vol.Schema({
             vol.Required(CONF_HOST, default=defaults.get(CONF_HOST, "")): str,
             vol.Required(CONF_PORT, default=defaults.get(CONF_PORT, UDP_PORT_DEFAULT)): int,
+            vol.Required(CONF_TRANSPORT, default=TRANSPORT_UDP): vol.In([TRANSPORT_UDP, TRANSPORT_TCP]),
         })
-        return self.async_show_form(step_id="user", data_schema=data_schema)
+        return self.async_show_form(step_id="tower", data_schema=data_schema)
+
+    async def async_step_group(self, user_input: dict[str, Any] | None = None) -> FlowResult:
+        """Create a group that drives several towers as one set of entities."""
+        towers = self._async_tower_entries()
+        errors: dict[str, str] = {}
+        if user_input is not None:
+            members = [m for m in user_input[CONF_MEMBERS] if m in towers]
+            if not members:
+                errors[CONF_MEMBERS] = "no_members"
+            else:
+                await self.async_set_unique_id(f"group-{user_input[CONF_NAME].strip().lower()}")
+                self._abort_if_unique_id_configured()
+                data = {
+                    CONF_TYPE: ENTRY_TYPE_GROUP,
+                    CONF_NAME: user_input[CONF_NAME].strip(),
+                    CONF_MEMBERS: members,
+                }
+                return self.async_create_entry(title=data[CONF_NAME], data=data)
+
+        data_schema = vol.Schema({
+            vol.Required(CONF_NAME): str,
+            vol.Required(CONF_MEMBERS): cv.multi_select(towers),
+        })
+        return self.async_show_form(step_id="group", data_schema=data_schema, errors=errors)
 
     async def async_step_import(self, import_config: dict[str, Any]) -> FlowResult:
-        """Support YAML import if you add it later."""
-        return await self.async_step_user(import_config)
+        """Towers from a bulk import or a scan; already probed, so no form."""
+        return await self.async_step_tower(import_config)
 
     async def async_step_dhcp(self, discovery_info: DhcpServiceInfo) -> FlowResult:
         """Handle DHCP discovery.
@@ -59,5 +201,36 @@ class PatliteConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
         # Not configured yet — store discovery and ask user to confirm or edit port.
         self._discovered = {"host": host}
-        # Go straight to the user form with suggested host/port
-        return await self.async_step_user()
+        # Go straight to the tower form with suggested host/port
+        return await self.async_step_tower()
+
+
+class PatliteOptionsFlow(config_entries.OptionsFlow):
+    """Per-tower tuning that does not change the device identity."""
+
+    def __init__(self, config_entry: config_entries.ConfigEntry):
+        self._entry = config_entry
+
+    async def async_step_init(self, user_input: dict[str, Any] | None = None) -> FlowResult:
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        options = self._entry.options
+        data_schema = vol.Schema({
+            vol.Required(
+                CONF_COALESCE_MS, default=options.get(CONF_COALESCE_MS, DEFAULT_COALESCE_MS)
+            ): vol.All(vol.Coerce(int), vol.Range(min=0, max=1000)),
+            vol.Required(
+                CONF_POLL_INTERVAL, default=options.get(CONF_POLL_INTERVAL, DEFAULT_POLL_INTERVAL_S)
+            ): vol.All(vol.Coerce(int), vol.Range(min=0, max=3600)),
+            vol.Required(
+                CONF_RATE_LIMIT, default=options.get(CONF_RATE_LIMIT, DEFAULT_RATE_LIMIT)
+            ): vol.All(vol.Coerce(float), vol.Range(min=0, max=100)),
+            vol.Required(
+                CONF_RATE_BURST, default=options.get(CONF_RATE_BURST, DEFAULT_RATE_BURST)
+            ): vol.All(vol.Coerce(int), vol.Range(min=1, max=50)),
+            vol.Required(
+                CONF_TRACE_FRAMES, default=options.get(CONF_TRACE_FRAMES, DEFAULT_TRACE_FRAMES)
+            ): vol.All(vol.Coerce(int), vol.Range(min=0, max=10000)),
+        })
+        return self.async_show_form(step_id="init", data_schema=data_schema)
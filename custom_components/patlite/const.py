@@ -19,8 +19,112 @@ INV_COLOR_MAP: dict[int, str] = {v: k for k, v in COLOR_MAP.items()}
 
 NUM_TIERS = 5
 
+# Config entries are towers unless data[CONF_TYPE] says otherwise
+ENTRY_TYPE_GROUP = "group"
+CONF_MEMBERS = "members"  # entry_ids of the towers in a group
+
+# Services
+SERVICE_PLAY_SEQUENCE = "play_sequence"
+SERVICE_STOP_SEQUENCE = "stop_sequence"
+ATTR_STEPS = "steps"
+ATTR_TIERS = "tiers"  # {tier number 1..5: colour name}
+ATTR_FLASH = "flash"
+ATTR_BUZZER = "buzzer"
+ATTR_DURATION = "duration"
+ATTR_REPEAT = "repeat"
+ATTR_RESTORE = "restore"
+SERVICE_SET_STATE = "set_state"
+SERVICE_CLAIM = "claim"
+SERVICE_RELEASE = "release"
+ATTR_SOURCE = "source"
+ATTR_PRIORITY = "priority"
+ATTR_TTL = "ttl"
+SERVICE_SNAPSHOT = "snapshot"
+SERVICE_RESTORE_SNAPSHOT = "restore_snapshot"
+ATTR_SNAPSHOT_ID = "snapshot_id"
+DEFAULT_SNAPSHOT_ID = "default"
+
 # Network defaults
 UDP_PORT_DEFAULT = 10000  # change if your device uses another port
-UDP_TIMEOUT_S = 2.0
+UDP_TIMEOUT_S = 0.5  # per attempt: how long to wait for the ACK/NAK reply
+ACK_RETRIES = 3  # resends before a command counts as timed out
+RETRY_BACKOFF_S = 0.1  # doubled on every retry ...
+RETRY_BACKOFF_MAX_S = 1.0  # ... up to this cap
 DEFAULT_ON_COLOR = 0x01  # Red by default
+
+# Transport: UDP datagrams, or one persistent TCP connection per tower (same port)
+CONF_TRANSPORT = "transport"
+TRANSPORT_UDP = "udp"
+TRANSPORT_TCP = "tcp"
+TCP_CONNECT_TIMEOUT_S = 2.0
+TCP_RECONNECT_BACKOFF_S = 0.5  # doubled on every failed connect ...
+TCP_RECONNECT_BACKOFF_MAX_S = 30.0  # ... up to this cap
+TCP_KEEPALIVE_IDLE_S = 10  # kernel keep-alive probes detect a dead peer while idle
+TCP_KEEPALIVE_INTERVAL_S = 5
+TCP_KEEPALIVE_COUNT = 3
+
+# Write scheduler: changes within this window are merged into one PNS frame
+CONF_COALESCE_MS = "coalesce_ms"
+DEFAULT_COALESCE_MS = 10  # 0 = flush on the next event-loop tick
+
+# Rate limiting (token bucket) in front of the send path; 0 = unlimited
+CONF_RATE_LIMIT = "rate_limit"  # frames per second, per tower (options flow)
+DEFAULT_RATE_LIMIT = 0
+CONF_RATE_BURST = "rate_burst"
+DEFAULT_RATE_BURST = 3
+CONF_GLOBAL_RATE_LIMIT = "global_rate_limit"  # frames per second over all towers (YAML)
+CONF_GLOBAL_RATE_BURST = "global_rate_burst"
+DEFAULT_GLOBAL_RATE_BURST = 20
+DATA_GLOBAL_LIMITER = f"{DOMAIN}_global_limiter"
+
+# Integration-wide shared objects (hass.data keys next to the per-entry dict)
+DATA_UDP_HUB = f"{DOMAIN}_udp_hub"
+DATA_POLL_SCHEDULER = f"{DOMAIN}_poll_scheduler"
+
+# Frame tracing: ring buffer of the last N frames per tower; 0 = off
+CONF_TRACE_FRAMES = "trace_frames"
+DEFAULT_TRACE_FRAMES = 0
+SERVICE_EXPORT_TRACE = "export_trace"
+ATTR_FORMAT = "format"
+TRACE_FORMATS = ("pcap", "jsonl")
+
+# Diagnostic sensors: sampled on this interval, not per packet, to spare the recorder
+SENSOR_INTERVAL_S = 30
+DATA_FLEET_SENSORS = f"{DOMAIN}_fleet_sensors"  # tracks which tower entry carries the fleet sensors
+
+# Active network scan (config flow)
+CONF_SUBNET = "subnet"
+CONF_HOSTS = "hosts"
+SCAN_CONCURRENCY = 64  # probes outstanding at once
+SCAN_TIMEOUT_S = 0.25  # per host; towers on the LAN answer in a few ms
+SCAN_CACHE_TTL_S = 600  # rescans within this time only probe new hosts
+SCAN_MAX_HOSTS = 1024  # largest subnet we scan (/22)
+DATA_SCAN_CACHE = f"{DOMAIN}_scan_cache"
+
+# Bulk import of a site's towers (YAML list and/or CSV file)
+CONF_TOWERS = "towers"
+CONF_TOWERS_CSV = "towers_csv"  # path relative to the config directory
+CONF_AREA = "area"
+IMPORT_TIMEOUT_S = 1.0  # per tower; longer than a scan since a miss means a tower is left out
+
+# Local signal ingest: PLCs send "signal value" datagrams, rules map them to tower states
+CONF_INGEST = "ingest"
+CONF_RULES = "rules"
+CONF_SIGNAL = "signal"
+CONF_VALUE = "value"
+CONF_TOWER = "tower"  # host, host:port or name of a tower or group
+CONF_SOURCES = "sources"  # addresses allowed to send signals (empty = any)
+DEFAULT_INGEST_PORT = 10020
+DATA_INGEST = f"{DOMAIN}_ingest"
+
+# After a restart each tower gets its restored state as one frame, at a random
+# point in this window so a whole plant restarting does not send every frame at once
+RESTORE_STAGGER_S = 5.0
+
+# Status polling: slow when idle, fast for a while after we wrote something
+CONF_POLL_INTERVAL = "poll_interval"
+DEFAULT_POLL_INTERVAL_S = 30  # idle interval; 0 disables polling
+POLL_FAST_INTERVAL_S = 2.0
+POLL_FAST_PERIOD_S = 10.0  # how long after a write to keep polling fast
+POLL_JITTER = 0.1  # +/- fraction applied to every interval
 BIT_ORDER_MSB_FIRST = False
\ No newline at end of file
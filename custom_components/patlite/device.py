@@ -1,140 +1,700 @@
 from __future__ import annotations
+import asyncio
 import logging
-import socket
-from typing import Final, Callable
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Final, Callable, Mapping, Sequence
 
-from .const import NUM_TIERS, UDP_TIMEOUT_S, DEFAULT_ON_COLOR
+from .const import NUM_TIERS, DEFAULT_ON_COLOR, DEFAULT_COALESCE_MS
+from .arbitration import ClaimArbiter, FLASH_SLOT, BUZZER_SLOT
+from .protocol import PnsRequestEngine, PnsTimeoutError, PnsNakError, PnsError, PNS_NAK
+from .sequence import SequencePlayer, SequenceStep
+from .stats import DeliveryStats, LatencyHistogram
+from .ratelimit import TokenBucket
+from .state import TowerState
+from .trace import FrameTrace
+from .hub import HubEndpoint
+from .transport import PnsUdpTransport, PnsTcpTransport
 
 _LOGGER: Final = logging.getLogger(__name__)
 
 # PNS "Detailed Motion Control" (fixed header for 5 tiers + flash + buzzer)
 _PNS_HEADER = bytes([0x41, 0x42, 0x44, 0x00, 0x00, 0x07])
 _PNS_DATA_LEN = 7  # 5 colors + flash + buzzer
+# Byte offsets inside a frame
+_DATA_OFFSET = len(_PNS_HEADER)
+_FLASH_OFFSET = _DATA_OFFSET + 5
+_BUZZER_OFFSET = _DATA_OFFSET + 6
+# PNS "Status Acquisition": reply is the same 7 data bytes, optionally led by a mode byte
+_PNS_STATUS_CMD = bytes([0x41, 0x42, 0x47, 0x00, 0x00, 0x00])
+_STATUS_REPLY_SIZES = (1, _PNS_DATA_LEN, _PNS_DATA_LEN + 1)  # NAK, data, mode byte + data
 
+# Listener keys: one per tier plus flash and buzzer
+KEY_FLASH: Final = "flash"
+KEY_BUZZER: Final = "buzzer"
 
-class PatliteDevice:
-    """Patlite towers using 'Detailed Motion Control'"""
 
-    def __init__(self, host: str, port: int):
-        self.host = host
-        self.port = port
-        self.tier_colors: list[int] = [0x00] * NUM_TIERS  # 00..09
-        self.tier_enabled: list[bool] = [False] * NUM_TIERS
-        self.flash: int = 0  # 01=ON, 00=OFF
-        self.buzzer: int = 0  # 00 stop, 01..0B patterns
-        self._last_nonzero_color: list[int | None] = [None] * NUM_TIERS
+def tier_key(tier: int) -> str:
+    return f"tier{tier}"
+
+
+def build_frame(colors: Sequence[int], flash: int | bool, buzzer: int) -> bytes:
+    """Build a complete 'Detailed Motion Control' frame from explicit values."""
+    if len(colors) != NUM_TIERS:
+        raise ValueError(f"Need {NUM_TIERS} colour codes, got {len(colors)}")
+    return _PNS_HEADER + bytes(colors) + bytes([1 if flash else 0, _coerce_buzzer(buzzer)])
+
+
+class PatliteTowerBase(ABC):
+    """Tower state, the setters HA entities use, and keyed listeners.
+
+    Subclasses decide how state reaches hardware by implementing
+    ``_schedule_flush``/``async_flush``.
+    """
+
+    model = "Tower"
+    available: bool = True
+    restored: bool = False  # some state came from before a restart
+    trace: FrameTrace | None = None  # frame trace, None while tracing is off
+
+    def __init__(self, uid: str, name: str, name_prefix: str = "Patlite"):
+        self.uid = uid  # stable id used for unique_ids and the HA device
+        self.name = name
+        self.name_prefix = name_prefix  # leading part of entity names
+        self._state = TowerState()  # everything the entities show; replaced, never mutated
+        self.snapshots: dict[str, TowerState] = {}  # saved by the snapshot service
+        self._origins: dict[str, None] = {}  # what caused the pending frame (tracing only)
+        # The outgoing frame, kept in sync in place by every setter
+        self._frame = bytearray(_PNS_HEADER) + bytearray(self._state.data())
+        # Values forced by priority claims (per tier, flash, buzzer); None = entity state
+        self._override: list[int | None] = [None] * (NUM_TIERS + 2)
+
+        # --- listeners for HA entities, keyed by the part of the state they show ---
+        self._listeners: dict[str | None, list[Callable[[], None]]] = {}
+        self._notified: dict[str, Any] = self._key_states()
+        self.fanout = LatencyHistogram()  # time spent calling listeners per notify
+
+    @abstractmethod
+    async def async_flush(self) -> None:
+        """Push pending state to the hardware now."""
+
+    @abstractmethod
+    def close(self) -> None:
+        """Cancel pending work and release the connection."""
 
-        # --- simple listeners for HA entities ---
-        self._listeners: list[Callable[[], None]] = []
+    # ---------- State ----------
+    @property
+    def state(self) -> TowerState:
+        return self._state
+
+    @property
+    def tier_colors(self) -> tuple[int, ...]:
+        return tuple(self._state.color(t) for t in range(NUM_TIERS))  # 00..09
+
+    @property
+    def tier_enabled(self) -> tuple[bool, ...]:
+        return tuple(self._state.enabled(t) for t in range(NUM_TIERS))
+
+    @property
+    def flash(self) -> int:
+        return self._state.flash  # 01=ON, 00=OFF
+
+    @property
+    def buzzer(self) -> int:
+        return self._state.buzzer  # 00 stop, 01..0B patterns
 
     # ---------- Public API ----------
-    def set_tier_color(self, tier: int, code: int) -> None:
+    async def async_set_tier_color(self, tier: int, code: int) -> None:
         self._validate_tier(tier)
         code = int(code)
         if not (0x00 <= code <= 0xFF):
             raise ValueError("Invalid color code")
-        self.tier_colors[tier] = code
-        if code:
-            self._last_nonzero_color[tier] = code
-            self.tier_enabled[tier] = True  # UI power follows color
-        self._send()
+        # UI power follows color
+        self._state = self._state.with_tier(tier, code, True if code else None, code or None)
+        self._sync_tier(tier)
+        self._schedule_flush()
         self._notify()
 
-    def set_tier_power(self, tier: int, on: bool) -> None:
+    async def async_set_tier_power(self, tier: int, on: bool) -> None:
         self._validate_tier(tier)
-        self.tier_enabled[tier] = bool(on)
+        state = self._state
         if on:
-            if self.tier_colors[tier] == 0x00:
-                last = self._last_nonzero_color[tier]
-                self.tier_colors[tier] = last if last is not None else DEFAULT_ON_COLOR
+            color = None
+            if state.color(tier) == 0x00:
+                last = state.last_color(tier)
+                color = last if last is not None else DEFAULT_ON_COLOR
+            self._state = state.with_tier(tier, color, True)
         else:
-            self.tier_colors[tier] = 0x00
-        self._send()
+            self._state = state.with_tier(tier, 0x00, False)
+        self._sync_tier(tier)
+        self._schedule_flush()
         self._notify()
 
-    def set_flash(self, value: int | bool) -> None:
-        self.flash = 1 if bool(value) else 0
-        self._send()
+    async def async_set_flash(self, value: int | bool) -> None:
+        self._state = self._state.with_flash(value)
+        self._sync_flash()
+        self._schedule_flush()
         self._notify()
 
-    def set_buzzer(self, value: int | bool | int) -> None:
-        if isinstance(value, bool):
-            self.buzzer = 1 if value else 0
-        else:
-            pat = int(value)
-            if not (0x00 <= pat <= 0x0B):
-                raise ValueError("Buzzer pattern out of range (0x00..0x0B)")
-            self.buzzer = pat
-        self._send()
+    async def async_set_buzzer(self, value: int | bool | int) -> None:
+        self._state = self._state.with_buzzer(_coerce_buzzer(value))
+        self._sync_buzzer()
+        self._schedule_flush()
         self._notify()
 
+    async def async_set_state(
+        self,
+        tiers: Mapping[int, int] | None = None,
+        flash: int | bool | None = None,
+        buzzer: int | bool | None = None,
+        flush: bool = False,
+    ) -> None:
+        """Change several parts of the tower at once: one notify, one frame.
+
+        ``tiers`` maps tier index to a colour code; 0 powers the tier off and
+        keeps its last colour. With ``flush`` the frame goes out right away
+        instead of after the coalesce window.
+        """
+        tiers = dict(tiers or {})
+        for tier, code in tiers.items():
+            self._validate_tier(tier)
+            if not (0x00 <= int(code) <= 0xFF):
+                raise ValueError(f"color code out of range: {code}")
+        if buzzer is not None:
+            buzzer = _coerce_buzzer(buzzer)
+
+        state = self._state
+        for tier, code in tiers.items():
+            code = int(code)
+            state = state.with_tier(tier, code, code != 0x00, code or None)
+        if flash is not None:
+            state = state.with_flash(flash)
+        if buzzer is not None:
+            state = state.with_buzzer(buzzer)
+        self._state = state
+        for tier in tiers:
+            self._sync_tier(tier)
+        if flash is not None:
+            self._sync_flash()
+        if buzzer is not None:
+            self._sync_buzzer()
+        self._schedule_flush()
+        self._notify()
+        if flush:
+            await self.async_flush()
+
     # Legacy compatibility
-    def set_tier_onoff(self, tier: int, on: bool) -> None:
-        self.set_tier_power(tier, on)
+    async def async_set_tier_onoff(self, tier: int, on: bool) -> None:
+        await self.async_set_tier_power(tier, on)
 
-    def set_tier_state(self, tier: int, state) -> None:
+    async def async_set_tier_state(self, tier: int, state) -> None:
         if isinstance(state, bool):
-            self.set_tier_power(tier, state)
+            await self.async_set_tier_power(tier, state)
             return
         code = int(state)
         if not (0x00 <= code <= 0xFF):
             raise ValueError(f"color code out of range: {code}")
-        self.set_tier_color(tier, code)
-        self.set_tier_power(tier, code != 0x00)
+        await self.async_set_tier_color(tier, code)
+        await self.async_set_tier_power(tier, code != 0x00)
 
     def get_last_color_code(self, tier: int) -> int | None:
         self._validate_tier(tier)
-        return self._last_nonzero_color[tier]
+        return self._state.last_color(tier)
+
+    # ---------- Snapshots ----------
+    def snapshot(self) -> TowerState:
+        """The current state; immutable, so holding on to it is the whole snapshot."""
+        return self._state
+
+    async def async_restore_snapshot(self, state: TowerState) -> None:
+        """Go back to a snapshot. Nothing is sent if the tower already shows that frame."""
+        if state == self._state:
+            return
+        self._state = state
+        for tier in range(NUM_TIERS):
+            self._sync_tier(tier)
+        self._sync_flash()
+        self._sync_buzzer()
+        self._schedule_flush()
+        self._notify()
+
+    # ---------- Restore after restart ----------
+    def restore(
+        self,
+        tier: int | None = None,
+        enabled: bool | None = None,
+        last_color: int | None = None,
+        flash: int | bool | None = None,
+        buzzer: int | None = None,
+    ) -> None:
+        """Adopt part of the state from before a restart without sending anything.
+
+        Entities call this as they are added; the reconciled frame is sent
+        once afterwards (see ``PatliteDevice.schedule_restore_flush``).
+        """
+        if tier is not None:
+            self._validate_tier(tier)
+            state = self._state.with_tier(tier, enabled=enabled, last_color=int(last_color) if last_color else None)
+            last = state.last_color(tier)
+            if state.enabled(tier):
+                state = state.with_tier(tier, last if last is not None else DEFAULT_ON_COLOR)
+            else:
+                state = state.with_tier(tier, 0x00)
+            self._state = state
+            self._sync_tier(tier)
+        if flash is not None:
+            self._state = self._state.with_flash(flash)
+            self._sync_flash()
+        if buzzer is not None:
+            self._state = self._state.with_buzzer(_coerce_buzzer(buzzer))
+            self._sync_buzzer()
+        self.restored = True
+        self._notify()
+
+    def note_origin(self, origin: str) -> None:
+        """Record what caused the next frame (an entity, service call, ...) for the trace."""
+        if self.trace is not None:
+            self._origins[origin] = None
 
     # ---------- Listener API ----------
-    def add_listener(self, listener: Callable[[], None]) -> Callable[[], None]:
-        """Register a callback invoked after state changes. Returns unsubscribe."""
-        self._listeners.append(listener)
+    def add_listener(self, listener: Callable[[], None], key: str | None = None) -> Callable[[], None]:
+        """Register a callback invoked after state changes. Returns unsubscribe.
+
+        With ``key`` (``tier_key(n)``, ``KEY_FLASH`` or ``KEY_BUZZER``) the
+        callback only fires when that part of the state changes; without it,
+        on every change.
+        """
+        self._listeners.setdefault(key, []).append(listener)
         def _unsub():
             try:
-                self._listeners.remove(listener)
-            except ValueError:
+                self._listeners[key].remove(listener)
+            except (KeyError, ValueError):
                 pass
         return _unsub
 
-    def _notify(self) -> None:
-        for cb in list(self._listeners):
-            try:
-                cb()
-            except Exception as exc:
-                _LOGGER.debug("Listener callback error: %s", exc)
+    def _key_states(self) -> dict[str, Any]:
+        state = self._state
+        states: dict[str, Any] = {tier_key(i): state.tier_bits(i) for i in range(NUM_TIERS)}
+        states[KEY_FLASH] = state.flash
+        states[KEY_BUZZER] = state.buzzer
+        return states
+
+    def _notify(self, force: bool = False) -> None:
+        """Call the listeners of every key whose state changed since the last notify.
+
+        ``force`` calls every listener (availability affects all entities).
+        """
+        states = self._key_states()
+        if force:
+            changed = list(self._listeners)
+        else:
+            changed = [key for key, value in states.items() if self._notified[key] != value]
+            if not changed:
+                return
+            changed.append(None)
+        self._notified = states
+        start = time.perf_counter()
+        for key in changed:
+            for cb in list(self._listeners.get(key, ())):
+                try:
+                    cb()
+                except Exception as exc:
+                    _LOGGER.debug("Listener callback error: %s", exc)
+        self.fanout.observe((time.perf_counter() - start) * 1000)
 
     # ---------- Helpers ----------
     def _validate_tier(self, tier: int) -> None:
         if not (0 <= tier < NUM_TIERS):
             raise ValueError("Tier out of range")
 
+    def tier_code(self, tier: int) -> int:
+        """Colour code this tier shows on the tower (an 'on' tier is never 0x00)."""
+        return self._state.tier_code(tier)
+
+    def _sync_tier(self, tier: int) -> None:
+        forced = self._override[tier]
+        self._frame[_DATA_OFFSET + tier] = forced if forced is not None else self.tier_code(tier)
+
+    def _sync_flash(self) -> None:
+        forced = self._override[FLASH_SLOT]
+        self._frame[_FLASH_OFFSET] = forced if forced is not None else self.flash
+
+    def _sync_buzzer(self) -> None:
+        forced = self._override[BUZZER_SLOT]
+        self._frame[_BUZZER_OFFSET] = forced if forced is not None else self.buzzer
+
     def _build_packet(self) -> bytes:
         """
-        Build PNS 'Detailed Motion Control' frame:
+        Snapshot of the PNS 'Detailed Motion Control' frame:
           [ 'A','B','D', 0x00, 0x00, 0x07, T1, T2, T3, T4, T5, Flash, Buzzer ]
         """
-        colors = list(self.tier_colors[:5])
-        while len(colors) < 5:
-            colors.append(0x00)
-        # Ensure 'on' tiers have a non-zero color
-        for i in range(5):
-            if self.tier_enabled[i] and colors[i] == 0x00:
-                last = self._last_nonzero_color[i]
-                colors[i] = last if last is not None else DEFAULT_ON_COLOR
-        data = bytes(colors) + bytes([self.flash & 0x01, self.buzzer & 0xFF])
-        assert len(data) == _PNS_DATA_LEN, f"PNS data must be 7 bytes, got {len(data)}"
-        return _PNS_HEADER + data
-
-    def _send(self) -> None:
-        pkt = self._build_packet()
-        _LOGGER.debug(
-            "TX %s:%s PNS colors=%s flash=%s buzzer=%s pkt=%s",
-            self.host, self.port, self.tier_colors[:5], self.flash, self.buzzer, pkt.hex()
-        )
+        return bytes(self._frame)
+
+    @abstractmethod
+    def _schedule_flush(self) -> None:
+        """Arrange for the current state to be flushed soon."""
+
+
+class PatliteDevice(PatliteTowerBase):
+    """Patlite towers using 'Detailed Motion Control'"""
+
+    model = "UDP Tower"
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        transport: PnsUdpTransport | PnsTcpTransport | HubEndpoint | None = None,
+        coalesce_ms: int = DEFAULT_COALESCE_MS,
+        limiters: Sequence[TokenBucket] = (),
+        name: str | None = None,
+    ):
+        super().__init__(uid=f"{host}:{port}", name=name or f"Patlite @ {host}")
+        self.host = host
+        self.port = port
+        self._transport = transport if transport is not None else PnsUdpTransport(host, port)
+        if self._transport.stream:
+            self.model = "TCP Tower"
+        self.stats = DeliveryStats()
+        self._engine = PnsRequestEngine(self._transport, self.stats)
+        self.available: bool = True  # optimistic until a command goes unanswered
+        # 0 = flush on the next event-loop tick, otherwise wait this long for more changes
+        self.coalesce_window: float = max(0, coalesce_ms) / 1000
+
+        # --- write scheduler ---
+        self._flush_handle: asyncio.TimerHandle | asyncio.Handle | None = None
+        self._flush_task: asyncio.Task | None = None
+        self._flush_lock = asyncio.Lock()
+        self._restore_handle: asyncio.TimerHandle | None = None
+        # Own and integration-wide token buckets; a frame needs a token from each
+        self._limiters = tuple(limiters)
+        self._throttled_frame: bytes | None = None  # frame waiting for a token
+        self._last_frame: bytes | None = None  # last frame the tower ACKed
+        self._unacked = False  # the last send got no ACK (timeout, NAK, no connection)
+        self._write_seq = 0
+        self.last_write: float = 0.0  # monotonic time of the last local change
+        self.on_write: Callable[[], None] | None = None  # poked on every local change
+        self.on_availability: Callable[[], None] | None = None  # poked when available flips
+
+        # --- priority claims ---
+        self._arbiter = ClaimArbiter(self._claims_changed)
+
+        # --- sequencer ---
+        self._sequence: SequencePlayer | None = None
+        self._sequence_task: asyncio.Task | None = None
+
+    def enable_trace(self, size: int) -> None:
+        """Keep the last ``size`` frames sent and received; 0 turns tracing off."""
+        self.trace = FrameTrace(self.host, self.port, size) if size > 0 else None
+        self._engine.trace = self.trace
+        self._origins.clear()
+
+    # ---------- Transport lifecycle ----------
+    async def async_connect(self) -> None:
+        """Open the long-lived socket to the tower. Raises OSError on failure."""
+        await self._transport.async_open()
+
+    def close(self) -> None:
+        self.stop_sequence(restore=False)
+        self._arbiter.clear()
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if self._restore_handle is not None:
+            self._restore_handle.cancel()
+            self._restore_handle = None
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        self._transport.close()
+
+    async def async_flush(self) -> None:
+        """Send the current tower state now instead of waiting for the coalesce window."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        # One frame in flight at a time; whoever gets the lock next sends the newest state
+        async with self._flush_lock:
+            if self._frame == self._last_frame:
+                # The tower already acknowledged exactly this frame; no frame, nothing to blame
+                self._origins.clear()
+                return
+            if self._limiters:
+                await self._async_wait_token(self._frame)
+                if self._frame == self._last_frame:
+                    self._origins.clear()
+                    return
+            # Snapshot: the buffer may change again while we wait for the ACK
+            await self._async_send(bytes(self._frame))
+
+    # ---------- Priority claims ----------
+    def claim(
+        self,
+        source: str,
+        priority: int,
+        tiers: Mapping[int, int] | None = None,
+        flash: int | bool | None = None,
+        buzzer: int | bool | None = None,
+        ttl: float | None = None,
+    ) -> None:
+        """Hold part of the tower for ``source`` at ``priority``.
+
+        For every tier, flash and buzzer the highest-priority active claim
+        wins; unclaimed parts show the entity state. Claiming again with the
+        same source replaces the earlier claim, so a retriggering automation
+        does not produce new frames. ``ttl`` (seconds) releases it automatically.
+        """
+        tiers = dict(tiers or {})
+        for tier, code in tiers.items():
+            self._validate_tier(tier)
+            if not (0x00 <= int(code) <= 0xFF):
+                raise ValueError(f"color code out of range: {code}")
+        if buzzer is not None:
+            buzzer = _coerce_buzzer(buzzer)
+        self.note_origin(f"claim {source}")
+        self._arbiter.claim(source, priority, tiers, flash, buzzer, ttl)
+
+    def release(self, source: str) -> bool:
+        """Drop the claim held by ``source``. Returns False if it held none."""
+        self.note_origin(f"release {source}")
+        return self._arbiter.release(source)
+
+    @property
+    def claims(self) -> dict[str, dict[str, Any]]:
+        return {source: c.as_dict() for source, c in self._arbiter.claims.items()}
+
+    def _claims_changed(self) -> None:
+        self._override = self._arbiter.resolve()
+        for tier in range(NUM_TIERS):
+            self._sync_tier(tier)
+        self._sync_flash()
+        self._sync_buzzer()
+        # Only a changed resolved frame costs a packet
+        if self._frame != self._last_frame:
+            self._schedule_flush()
+
+    # ---------- Sequencer ----------
+    def play_sequence(self, steps: Sequence[SequenceStep], repeat: int = 1) -> None:
+        """Play precomputed frames; any normal write stops the sequence.
+
+        When the sequence ends on its own the tower goes back to the device
+        state. ``repeat`` 0 loops until stopped.
+        """
+        self.stop_sequence(restore=False)
+        if self._flush_handle is not None:
+            # A pending write would land on top of the first step
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        self._sequence = SequencePlayer(self._send_sequence_frame, steps, repeat, self._sequence_done)
+        self._sequence.start()
+
+    def stop_sequence(self, restore: bool = True) -> None:
+        if self._sequence is None:
+            return
+        self._sequence.cancel()
+        self._sequence = None
+        if self._sequence_task is not None:
+            self._sequence_task.cancel()
+            self._sequence_task = None
+        if restore:
+            self._flush_due()
+
+    @property
+    def sequence_running(self) -> bool:
+        return self._sequence is not None
+
+    def _sequence_done(self) -> None:
+        self._sequence = None
+        self._flush_due()
+
+    def _send_sequence_frame(self, frame: bytes) -> None:
+        self.note_origin("sequence")
+        # Latest step wins: if the previous one is still retrying, drop it
+        if self._sequence_task is not None and not self._sequence_task.done():
+            self._sequence_task.cancel()
+        self._sequence_task = asyncio.get_running_loop().create_task(self._async_send_locked(frame))
+
+    async def _async_send_locked(self, pkt: bytes) -> None:
+        async with self._flush_lock:
+            if pkt == self._last_frame:
+                self._origins.clear()
+                return
+            if self._limiters:
+                await self._async_wait_token(pkt)
+            await self._async_send(pkt)
+
+    async def _async_wait_token(self, frame: bytes | bytearray) -> None:
+        """Wait until every limiter has a token, then take one from each.
+
+        The caller sends whatever is newest afterwards, so changes made during
+        the wait collapse into a single frame.
+        """
+        wait = max(bucket.delay() for bucket in self._limiters)
+        if wait > 0:
+            self.stats.throttled += 1
+            self._throttled_frame = bytes(frame)
+            try:
+                while wait > 0:
+                    await asyncio.sleep(wait)
+                    wait = max(bucket.delay() for bucket in self._limiters)
+            finally:
+                self._throttled_frame = None
+        for bucket in self._limiters:
+            bucket.take()
+
+    # ---------- Status read ----------
+    async def async_refresh_status(self) -> bool:
+        """Read the tower's actual state and adopt it.
+
+        Returns True if it differed from what we had (listeners are notified).
+        Raises PnsNakError if the firmware does not support status reads and
+        PnsError if the tower does not answer.
+        """
+        seq = self._write_seq
         try:
-            with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
-                s.settimeout(UDP_TIMEOUT_S)
-                s.sendto(pkt, (self.host, self.port))
-        except Exception as exc:
-            _LOGGER.exception("UDP send failed: %s", exc)
+            reply = await self._engine.async_request(
+                _PNS_STATUS_CMD, _is_status_reply, "status read", _STATUS_REPLY_SIZES
+            )
+        except PnsError:
+            self._set_available(False)
+            raise
+        self._set_available(True)
+        if reply[0] == PNS_NAK:
+            raise PnsNakError(f"Tower {self.host}:{self.port} rejected status read")
+        if (
+            seq != self._write_seq
+            or self._flush_handle is not None
+            or self._restore_handle is not None
+            or self._flush_lock.locked()
+        ):
+            # A local write happened meanwhile; it is newer than this reading
+            return False
+        if self._sequence is not None or self._arbiter.claims:
+            # The tower shows a sequence step or claimed values, not the entity state
+            return False
+
+        data = reply[-_PNS_DATA_LEN:]
+        if self._frame[_DATA_OFFSET:] == data:
+            self._last_frame = bytes(self._frame)
+            self._unacked = False
+            return False
+        if self._unacked and self._frame != self._last_frame:
+            # Our last command never got through: the tower still shows the old
+            # state. Send the command again rather than adopting that reading.
+            self._flush_handle = asyncio.get_running_loop().call_soon(self._flush_due)
+            return False
+
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("RX %s:%s status differs from local state: %s", self.host, self.port, data.hex())
+        self._state = TowerState.from_data(data, self._state)
+        self._frame[_DATA_OFFSET:] = data
+        self._frame[_FLASH_OFFSET] = self.flash
+        self._last_frame = bytes(self._frame)
+        self._notify()
+        return True
+
+    # ---------- Helpers ----------
+    def _set_available(self, available: bool) -> None:
+        if available == self.available:
+            return
+        self.available = available
+        if available:
+            _LOGGER.info("Patlite %s:%s is answering again", self.host, self.port)
+        else:
+            _LOGGER.warning("Patlite %s:%s is not answering", self.host, self.port)
+        self._notify(force=True)
+        if self.on_availability is not None:
+            self.on_availability()
+
+    def schedule_restore_flush(self, delay: float) -> None:
+        """Send the restored state as one frame after ``delay`` seconds.
+
+        Nothing is sent if no entity restored anything. A local change before
+        then sends right away and carries the restored state with it.
+        """
+        if not self.restored or self._restore_handle is not None:
+            return
+        self._restore_handle = asyncio.get_running_loop().call_later(delay, self._restore_due)
+
+    def _restore_due(self) -> None:
+        self._restore_handle = None
+        if self._flush_handle is None:
+            self._flush_due()
+
+    def _schedule_flush(self) -> None:
+        """Mark state dirty; the whole tower goes out as one frame per window."""
+        if self._sequence is not None:
+            # Normal writes preempt a running sequence
+            self.stop_sequence(restore=False)
+        if self._restore_handle is not None:
+            self._restore_handle.cancel()
+            self._restore_handle = None
+        if self._throttled_frame is not None and self._frame != self._throttled_frame:
+            # The frame waiting for a token is superseded and will never be sent
+            self.stats.suppressed += 1
+            self._throttled_frame = bytes(self._frame)
+        self._write_seq += 1
+        self.stats.commands += 1
+        self.last_write = time.monotonic()
+        if self.on_write is not None:
+            self.on_write()
+        if self._flush_handle is not None:
+            self.stats.coalesced += 1
+            return  # already pending, this change rides along
+        loop = asyncio.get_running_loop()
+        if self.coalesce_window > 0:
+            self._flush_handle = loop.call_later(self.coalesce_window, self._flush_due)
+        else:
+            self._flush_handle = loop.call_soon(self._flush_due)
+
+    def _flush_due(self) -> None:
+        self._flush_handle = None
+        self._flush_task = asyncio.get_running_loop().create_task(self.async_flush())
+
+    async def _async_send(self, pkt: bytes) -> None:
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            # Only pay for hex formatting when someone is actually reading it
+            _LOGGER.debug("TX %s:%s PNS pkt=%s", self.host, self.port, pkt.hex())
+        self._unacked = True
+        if not self._transport.connected:
+            # Socket was closed under us (e.g. network change); reopen lazily
+            try:
+                await self._transport.async_open()
+            except OSError as exc:
+                if self.available:
+                    _LOGGER.error("Connection to %s:%s unavailable: %s", self.host, self.port, exc)
+                self._set_available(False)
+                return
+        origin = None
+        if self.trace is not None:
+            origin = ", ".join(self._origins) or None
+            self._origins.clear()
+        try:
+            await self._engine.async_command(pkt, origin)
+        except PnsNakError as exc:
+            # Reachable but refused; keep _last_frame so the next flush retries it
+            _LOGGER.warning("%s", exc)
+            self._set_available(True)
+        except PnsTimeoutError as exc:
+            _LOGGER.debug("%s", exc)
+            self._set_available(False)
+        except PnsError as exc:
+            _LOGGER.error("Send to %s:%s failed: %s", self.host, self.port, exc)
+            self._set_available(False)
+        else:
+            self._last_frame = pkt
+            self._unacked = False
+            self._set_available(True)
+
+
+def _is_status_reply(data: bytes) -> bool:
+    return len(data) in (_PNS_DATA_LEN, _PNS_DATA_LEN + 1) or data == bytes([PNS_NAK])
+
+
+def _coerce_buzzer(value: int | bool) -> int:
+    if isinstance(value, bool):
+        return 1 if value else 0
+    pat = int(value)
+    if not (0x00 <= pat <= 0x0B):
+        raise ValueError("Buzzer pattern out of range (0x00..0x0B)")
+    return pat
@@ -1,48 +1,112 @@
 from __future__ import annotations
 
+import re
 from typing import Any
 import voluptuous as vol
 
-from homeassistant.const import CONF_ENTITY_ID, CONF_TYPE
+from homeassistant.const import CONF_DEVICE_ID, CONF_DOMAIN, CONF_ENTITY_ID, CONF_TYPE
 from homeassistant.core import HomeAssistant, Context
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.typing import ConfigType
 from homeassistant.helpers import config_validation as cv, entity_registry as er
-from homeassistant.components.device_automation import DEVICE_ACTION_SCHEMA
 from homeassistant.components.select import (
     DOMAIN as SELECT_DOMAIN,
     SERVICE_SELECT_OPTION,
 )
 
-# One action type: set the colour of a Patlite tier (Select entity)
-ACTION_TYPE_SET_COLOR = "set_color"
+from .const import DOMAIN, COLOR_MAP, NUM_TIERS
+from .services import async_get_loaded_device
 
-# Base schema for our action (entity + type); 'option' will be provided via capabilities
-ACTION_SCHEMA = DEVICE_ACTION_SCHEMA.extend(
+# Set the colour of a Patlite tier (Select entity)
+ACTION_TYPE_SET_COLOR = "set_color"
+# Device-level actions, executed directly on the PatliteDevice for the device_id
+ACTION_TYPE_TIER_ON = "tier_on"
+ACTION_TYPE_TIER_OFF = "tier_off"
+ACTION_TYPE_FLASH_ON = "flash_on"
+ACTION_TYPE_FLASH_OFF = "flash_off"
+ACTION_TYPE_SET_BUZZER = "set_buzzer"
+ACTION_TYPE_SET_STATE = "set_state"
+
+DEVICE_ACTION_TYPES = [
+    ACTION_TYPE_TIER_ON,
+    ACTION_TYPE_TIER_OFF,
+    ACTION_TYPE_FLASH_ON,
+    ACTION_TYPE_FLASH_OFF,
+    ACTION_TYPE_SET_BUZZER,
+    ACTION_TYPE_SET_STATE,
+]
+
+CONF_OPTION = "option"
+CONF_TIER = "tier"
+CONF_PATTERN = "pattern"
+CONF_FLASH = "flash"
+CONF_BUZZER = "buzzer"
+
+_TIER = vol.All(vol.Coerce(int), vol.Range(min=1, max=NUM_TIERS))
+_PATTERN = vol.All(vol.Coerce(int), vol.Range(min=0x00, max=0x0B))
+_STATE_FIELDS = {
+    **{vol.Optional(f"tier_{n}"): vol.In(list(COLOR_MAP)) for n in range(1, NUM_TIERS + 1)},
+    vol.Optional(CONF_FLASH): cv.boolean,
+    vol.Optional(CONF_BUZZER): _PATTERN,
+}
+
+# Extra fields per action type (shown by the automation editor, validated on load)
+_EXTRA_FIELDS: dict[str, dict] = {
+    ACTION_TYPE_TIER_ON: {vol.Required(CONF_TIER): _TIER},
+    ACTION_TYPE_TIER_OFF: {vol.Required(CONF_TIER): _TIER},
+    ACTION_TYPE_FLASH_ON: {},
+    ACTION_TYPE_FLASH_OFF: {},
+    ACTION_TYPE_SET_BUZZER: {vol.Required(CONF_PATTERN): _PATTERN},
+    ACTION_TYPE_SET_STATE: _STATE_FIELDS,
+}
+
+SET_COLOR_SCHEMA = cv.DEVICE_ACTION_BASE_SCHEMA.extend(
     {
-        vol.Required(CONF_TYPE): vol.In([ACTION_TYPE_SET_COLOR]),
+        vol.Required(CONF_TYPE): ACTION_TYPE_SET_COLOR,
         vol.Required(CONF_ENTITY_ID): cv.entity_domain(SELECT_DOMAIN),
+        vol.Required(CONF_OPTION): cv.string,
     }
 )
 
+ACTION_SCHEMAS: dict[str, vol.Schema] = {
+    ACTION_TYPE_SET_COLOR: SET_COLOR_SCHEMA,
+    **{
+        action_type: cv.DEVICE_ACTION_BASE_SCHEMA.extend({vol.Required(CONF_TYPE): action_type, **fields})
+        for action_type, fields in _EXTRA_FIELDS.items()
+    },
+}
+
+# unique_id of a tier colour select: "<device uid>-tier<n>-color"
+_SELECT_UID_RE = re.compile(r"-tier(\d+)-color$")
+
 
 async def async_get_actions(hass: HomeAssistant, device_id: str) -> list[dict[str, Any]]:
-    """Return device actions for all Patlite Select entities on this device."""
+    """Return device actions for a Patlite device: per-select colour actions plus device-level ones."""
     registry = er.async_get(hass)
     actions: list[dict[str, Any]] = []
+    ours = False
 
-    for entry in registry.entities.values():
-        if entry.device_id != device_id:
+    # Per-device index instead of walking the whole entity registry
+    for entry in er.async_entries_for_device(registry, device_id):
+        if entry.platform != DOMAIN:
             continue
+        ours = True
         if entry.domain != SELECT_DOMAIN:
             continue
 
         actions.append(
             {
+                CONF_DEVICE_ID: device_id,
+                CONF_DOMAIN: DOMAIN,
                 CONF_TYPE: ACTION_TYPE_SET_COLOR,
                 CONF_ENTITY_ID: entry.entity_id,
             }
         )
 
+    if ours:
+        actions.extend(
+            {CONF_DEVICE_ID: device_id, CONF_DOMAIN: DOMAIN, CONF_TYPE: t} for t in DEVICE_ACTION_TYPES
+        )
     return actions
 
 
@@ -51,8 +115,12 @@ async def async_get_action_capabilities(
 ) -> dict[str, vol.Schema]:
     """Return extra fields (capabilities) for the selected action.
 
-    We read the current Select entity's options and expose them as a dropdown.
+    For set_color we read the current Select entity's options and expose them as a dropdown.
     """
+    if config[CONF_TYPE] != ACTION_TYPE_SET_COLOR:
+        fields = _EXTRA_FIELDS.get(config[CONF_TYPE])
+        return {"extra_fields": vol.Schema(fields)} if fields else {}
+
     entity_id = config[CONF_ENTITY_ID]
     state = hass.states.get(entity_id)
     options = []
@@ -60,8 +128,8 @@ async def async_get_action_capabilities(
         # Select entities expose their options under the 'options' attribute
         options = list(state.attributes.get("options", []))
 
-    schema = vol.Schema({vol.Required("option"): vol.In(options)}) if options else vol.Schema(
-        {vol.Required("option"): cv.string}
+    schema = vol.Schema({vol.Required(CONF_OPTION): vol.In(options)}) if options else vol.Schema(
+        {vol.Required(CONF_OPTION): cv.string}
     )
     return {"extra_fields": schema}
 
@@ -69,17 +137,59 @@ async def async_get_action_capabilities(
 async def async_call_action_from_config(
     hass: HomeAssistant, config: ConfigType, variables: dict[str, Any], context: Context
 ) -> None:
-    """Execute the configured action."""
-    if config[CONF_TYPE] == ACTION_TYPE_SET_COLOR:
-        await hass.services.async_call(
-            SELECT_DOMAIN,
-            SERVICE_SELECT_OPTION,
-            {CONF_ENTITY_ID: config[CONF_ENTITY_ID], "option": config["option"]},
-            blocking=True,
-            context=context,
-        )
+    """Execute the configured action directly on the PatliteDevice."""
+    action_type = config[CONF_TYPE]
+    device = async_get_loaded_device(hass, config[CONF_DEVICE_ID])
+    origin = f"device action {action_type} ({context.id})" if context else f"device action {action_type}"
+
+    if action_type == ACTION_TYPE_SET_COLOR:
+        entry = er.async_get(hass).async_get(config[CONF_ENTITY_ID])
+        match = _SELECT_UID_RE.search(entry.unique_id) if entry else None
+        if device is None or match is None or config[CONF_OPTION] not in COLOR_MAP:
+            # Not something we can map to a tier: let the select entity handle it
+            await hass.services.async_call(
+                SELECT_DOMAIN,
+                SERVICE_SELECT_OPTION,
+                {CONF_ENTITY_ID: config[CONF_ENTITY_ID], "option": config[CONF_OPTION]},
+                blocking=True,
+                context=context,
+            )
+            return
+        tier = int(match.group(1))
+        option = config[CONF_OPTION]
+        device.note_origin(origin)
+        if option == "Off":
+            await device.async_set_tier_power(tier, False)
+        else:
+            await device.async_set_state({tier: COLOR_MAP[option]})
+        return
+
+    if device is None:
+        raise HomeAssistantError(f"Patlite device {config[CONF_DEVICE_ID]} is not loaded")
+    device.note_origin(origin)
+
+    if action_type == ACTION_TYPE_TIER_ON:
+        await device.async_set_tier_power(config[CONF_TIER] - 1, True)
+    elif action_type == ACTION_TYPE_TIER_OFF:
+        await device.async_set_tier_power(config[CONF_TIER] - 1, False)
+    elif action_type == ACTION_TYPE_FLASH_ON:
+        await device.async_set_flash(1)
+    elif action_type == ACTION_TYPE_FLASH_OFF:
+        await device.async_set_flash(0)
+    elif action_type == ACTION_TYPE_SET_BUZZER:
+        await device.async_set_buzzer(config[CONF_PATTERN])
+    elif action_type == ACTION_TYPE_SET_STATE:
+        tiers = {
+            n - 1: COLOR_MAP[config[f"tier_{n}"]]
+            for n in range(1, NUM_TIERS + 1)
+            if f"tier_{n}" in config
+        }
+        await device.async_set_state(tiers, flash=config.get(CONF_FLASH), buzzer=config.get(CONF_BUZZER))
 
 
 async def async_validate_action_config(hass: HomeAssistant, config: ConfigType) -> ConfigType:
     """Validate the device action config."""
-    return ACTION_SCHEMA(config)
+    schema = ACTION_SCHEMAS.get(config.get(CONF_TYPE))
+    if schema is None:
+        raise vol.Invalid(f"Unknown Patlite action type: {config.get(CONF_TYPE)}")
+    return schema(config)
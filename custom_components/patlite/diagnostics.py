@@ -0,0 +1,38 @@
+from __future__ import annotations
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN, DATA_INGEST
+from .device import PatliteDevice
+from .group import PatliteGroup
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict[str, Any]:
+    """Return state and delivery counters for the diagnostics download."""
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+    device: PatliteDevice | PatliteGroup = entry_data["device"]
+    if isinstance(device, PatliteGroup):
+        return {
+            "entry": {"data": dict(entry.data)},
+            "members": {m.uid: {"available": m.available, "stats": m.stats.as_dict()} for m in device.members},
+        }
+    return {
+        "entry": {
+            "data": dict(entry.data),
+            "options": dict(entry.options),
+            "setup_ms": entry_data.get("setup_ms"),
+        },
+        "device": {
+            "available": device.available,
+            "tier_colors": list(device.tier_colors),
+            "tier_enabled": list(device.tier_enabled),
+            "flash": device.flash,
+            "buzzer": device.buzzer,
+            "claims": device.claims,
+        },
+        "stats": device.stats.as_dict(),
+        "trace": device.trace.as_list() if device.trace is not None else None,
+        "ingest": hass.data[DATA_INGEST].as_dict() if DATA_INGEST in hass.data else None,
+    }
@@ -0,0 +1,118 @@
+from __future__ import annotations
+import asyncio
+import ipaddress
+import logging
+import socket
+import time
+from typing import Final
+
+from .const import SCAN_CONCURRENCY, SCAN_TIMEOUT_S, SCAN_CACHE_TTL_S
+from .device import _PNS_STATUS_CMD, _is_status_reply
+
+_LOGGER: Final = logging.getLogger(__name__)
+
+
+class _ScanProtocol(asyncio.DatagramProtocol):
+    """One unconnected socket for the whole scan; replies are matched by source address."""
+
+    def __init__(self):
+        self.waiting: dict[tuple[str, int], asyncio.Future[bool]] = {}
+
+    def datagram_received(self, data: bytes, addr) -> None:
+        fut = self.waiting.get(addr[:2])
+        if fut is not None and not fut.done() and _is_status_reply(data):
+            fut.set_result(True)
+
+    def error_received(self, exc: Exception) -> None:
+        # ICMP unreachable for one host must not end the scan
+        _LOGGER.debug("Scan socket error: %s", exc)
+
+
+class ScanCache:
+    """Per-host probe results, so rescanning the same subnet only probes what is stale."""
+
+    def __init__(self, ttl: float = SCAN_CACHE_TTL_S):
+        self.ttl = ttl
+        self._results: dict[str, tuple[float, bool]] = {}  # host -> (probed at, responded)
+
+    def get(self, host: str) -> bool | None:
+        hit = self._results.get(host)
+        if hit is None or time.monotonic() - hit[0] > self.ttl:
+            return None
+        return hit[1]
+
+    def put(self, host: str, responded: bool) -> None:
+        self._results[host] = (time.monotonic(), responded)
+
+
+async def async_scan(
+    network: ipaddress.IPv4Network,
+    port: int,
+    cache: ScanCache | None = None,
+    concurrency: int = SCAN_CONCURRENCY,
+    timeout: float = SCAN_TIMEOUT_S,
+) -> list[str]:
+    """Return the hosts in ``network`` that answer a PNS status read, in address order.
+
+    Up to ``concurrency`` probes are outstanding at once, each given
+    ``timeout`` seconds; hosts with a fresh entry in ``cache`` are not probed.
+    """
+    hosts = [str(ip) for ip in network.hosts()]
+    found = {host for host in hosts if cache is not None and cache.get(host)}
+    todo = [host for host in hosts if cache is None or cache.get(host) is None]
+    if todo:
+        start = time.monotonic()
+        responded = await async_probe([(host, port) for host in todo], concurrency, timeout)
+        if cache is not None:
+            for host in todo:
+                cache.put(host, (host, port) in responded)
+        found.update(host for host, _port in responded)
+        _LOGGER.debug(
+            "Scanned %d hosts of %s in %.2f s: %d towers", len(todo), network, time.monotonic() - start, len(found)
+        )
+    return sorted(found, key=ipaddress.IPv4Address)
+
+
+async def async_probe(
+    targets: list[tuple[str, int]],
+    concurrency: int = SCAN_CONCURRENCY,
+    timeout: float = SCAN_TIMEOUT_S,
+) -> set[tuple[str, int]]:
+    """Return the (host, port) targets that answer a PNS status read.
+
+    Hosts may be names; they are resolved inside the probe so lookups run
+    in parallel too. All probes share one socket, at most ``concurrency``
+    outstanding.
+    """
+    targets = list(dict.fromkeys(targets))
+    loop = asyncio.get_running_loop()
+    transport, protocol = await loop.create_datagram_endpoint(_ScanProtocol, local_addr=("0.0.0.0", 0))
+    slots = asyncio.Semaphore(concurrency)
+    found: set[tuple[str, int]] = set()
+
+    async def _probe(host: str, port: int) -> None:
+        async with slots:
+            try:
+                infos = await loop.getaddrinfo(host, port, family=socket.AF_INET, type=socket.SOCK_DGRAM)
+            except OSError:
+                return
+            addr: tuple[str, int] = infos[0][4][:2]
+            if addr in protocol.waiting:
+                return  # two names for one tower: the other probe reports it
+            fut: asyncio.Future[bool] = loop.create_future()
+            protocol.waiting[addr] = fut
+            try:
+                transport.sendto(_PNS_STATUS_CMD, addr)
+                responded = await asyncio.wait_for(fut, timeout)
+            except (asyncio.TimeoutError, OSError):
+                responded = False
+            finally:
+                del protocol.waiting[addr]
+        if responded:
+            found.add((host, port))
+
+    try:
+        await asyncio.gather(*(_probe(host, port) for host, port in targets))
+    finally:
+        transport.close()
+    return found
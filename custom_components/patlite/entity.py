@@ -0,0 +1,56 @@
+from __future__ import annotations
+from typing import Any
+
+from homeassistant.core import callback
+from homeassistant.helpers.restore_state import RestoreEntity
+
+from .const import DOMAIN
+from .device import PatliteTowerBase
+
+
+class PatliteEntity(RestoreEntity):
+    """Common base: device info, availability, keyed state updates and restore."""
+
+    _attr_should_poll = False
+
+    def __init__(self, device: PatliteTowerBase, listen_key: str | None):
+        self._device = device
+        self._listen_key = listen_key
+
+    async def async_added_to_hass(self) -> None:
+        # Extra data is stored even while the tower is unavailable, unlike the state
+        last = await self.async_get_last_extra_data()
+        if last is not None:
+            self._restore(last.as_dict())
+        # Only wake up for changes to the part of the tower this entity shows
+        self.async_on_remove(self._device.add_listener(self._device_updated, self._listen_key))
+
+    def _note_origin(self) -> None:
+        """Tag the frame this command causes with the entity and HA context (for the trace)."""
+        ctx = self._context
+        self._device.note_origin(f"{self.entity_id} ({ctx.id})" if ctx else self.entity_id)
+
+    def _restore(self, data: dict[str, Any]) -> None:
+        """Hand this entity's part of the pre-restart state to the device (nothing is sent)."""
+
+    @callback
+    def _device_updated(self) -> None:
+        # Device callbacks run on the event loop, so write state directly
+        self.async_write_ha_state()
+
+    @property
+    def available(self) -> bool:
+        return self._device.available
+
+    @property
+    def device_info(self) -> dict[str, Any]:
+        return tower_device_info(self._device)
+
+
+def tower_device_info(device: PatliteTowerBase) -> dict[str, Any]:
+    return {
+        "identifiers": {(DOMAIN, device.uid)},
+        "manufacturer": "Patlite",
+        "name": device.name,
+        "model": device.model,
+    }
@@ -0,0 +1,103 @@
+from __future__ import annotations
+import asyncio
+import logging
+from typing import Any, Final, Callable
+
+from .const import NUM_TIERS
+from .device import PatliteDevice, PatliteTowerBase, tier_key, KEY_FLASH, KEY_BUZZER
+
+_LOGGER: Final = logging.getLogger(__name__)
+
+
+class PatliteGroup(PatliteTowerBase):
+    """Several towers driven as one.
+
+    The group keeps its own (commanded) state. On flush, every part a setter
+    touched since the last flush is applied to every member, even if the
+    group's value did not change: a member may have been changed on its own
+    meanwhile. Each member builds its frame once (and skips it if already
+    ACKed), and all frames are sent together in one gather.
+    """
+
+    model = "Tower Group"
+
+    def __init__(self, group_id: str, name: str, resolve_members: Callable[[], list[PatliteDevice]]):
+        super().__init__(uid=f"group-{group_id}", name=name, name_prefix=name)
+        # Members are looked up on every flush, so towers loaded after the group still count
+        self._resolve_members = resolve_members
+        self._dirty: set[str] = set()  # keys set since the last flush
+        self._flush_handle: asyncio.Handle | None = None
+        self._flush_task: asyncio.Task | None = None
+        self._available = self.available  # as last shown to the entities
+
+    @property
+    def members(self) -> list[PatliteDevice]:
+        return self._resolve_members()
+
+    @property
+    def available(self) -> bool:
+        return any(m.available for m in self._resolve_members())
+
+    def members_changed(self) -> None:
+        """A member loaded, unloaded or changed availability: update the entities if ours changed."""
+        available = self.available
+        if available != self._available:
+            self._available = available
+            self._notify(force=True)
+
+    def close(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+
+    def note_origin(self, origin: str) -> None:
+        # The group sends nothing itself; its members carry the origin into their traces
+        for member in self._resolve_members():
+            member.note_origin(f"{origin} via {self.name}")
+
+    def restore(self, *args: Any, **kwargs: Any) -> None:
+        # Members restore their own state; the group only takes it back as its baseline
+        super().restore(*args, **kwargs)
+        self._dirty.clear()
+
+    async def async_flush(self) -> None:
+        """Apply what changed since the last flush to all members and send their frames at once."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        changed, self._dirty = self._dirty, set()
+        if not changed:
+            return
+
+        tiers = {i: self.tier_code(i) for i in range(NUM_TIERS) if tier_key(i) in changed}
+        flash = self.flash if KEY_FLASH in changed else None
+        buzzer = self.buzzer if KEY_BUZZER in changed else None
+        members = self._resolve_members()
+        _LOGGER.debug("Group %s: applying %s to %d towers", self.name, sorted(changed), len(members))
+        for member in members:
+            await member.async_set_state(tiers, flash=flash, buzzer=buzzer)
+        await asyncio.gather(*(member.async_flush() for member in members))
+
+    def _sync_tier(self, tier: int) -> None:
+        super()._sync_tier(tier)
+        self._dirty.add(tier_key(tier))
+
+    def _sync_flash(self) -> None:
+        super()._sync_flash()
+        self._dirty.add(KEY_FLASH)
+
+    def _sync_buzzer(self) -> None:
+        super()._sync_buzzer()
+        self._dirty.add(KEY_BUZZER)
+
+    def _schedule_flush(self) -> None:
+        # Everything set in the same loop tick (e.g. a scene) goes out together
+        if self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_soon(self._flush_due)
+
+    def _flush_due(self) -> None:
+        self._flush_handle = None
+        self._flush_task = asyncio.get_running_loop().create_task(self.async_flush())
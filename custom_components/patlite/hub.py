@@ -0,0 +1,136 @@
+from __future__ import annotations
+import asyncio
+import logging
+import socket
+from typing import Final, Callable
+
+_LOGGER: Final = logging.getLogger(__name__)
+
+
+class _HubProtocol(asyncio.DatagramProtocol):
+    """Forward socket events to the owning PnsUdpHub."""
+
+    def __init__(self, hub: PnsUdpHub):
+        self._hub = hub
+        self._transport: asyncio.BaseTransport | None = None
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        self._transport = transport
+
+    def datagram_received(self, data: bytes, addr) -> None:
+        self._hub._datagram_received(data, addr)
+
+    def error_received(self, exc: Exception) -> None:
+        # ICMP unreachable from one tower must not affect the others
+        _LOGGER.debug("UDP hub error: %s", exc)
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        self._hub._connection_lost(self._transport, exc)
+
+
+class PnsUdpHub:
+    """One UDP socket shared by every UDP tower of the integration.
+
+    Towers get a ``HubEndpoint`` with the PnsUdpTransport interface. Replies
+    are routed to the endpoint by their source address, so the socket count
+    stays at one however large the fleet gets. The socket is opened with the
+    first endpoint and closed with the last.
+    """
+
+    def __init__(self):
+        self._transport: asyncio.DatagramTransport | None = None
+        self._open_lock = asyncio.Lock()
+        self._routes: dict[tuple[str, int], HubEndpoint] = {}
+
+    @property
+    def connected(self) -> bool:
+        return self._transport is not None and not self._transport.is_closing()
+
+    def endpoint(self, host: str, port: int) -> HubEndpoint:
+        return HubEndpoint(self, host, port)
+
+    async def _async_attach(self, endpoint: HubEndpoint) -> tuple[str, int]:
+        """Resolve the tower's address, register its route, open the socket if needed."""
+        loop = asyncio.get_running_loop()
+        infos = await loop.getaddrinfo(endpoint.host, endpoint.port, family=socket.AF_INET, type=socket.SOCK_DGRAM)
+        if not infos:
+            raise OSError(f"Cannot resolve {endpoint.host}")
+        addr: tuple[str, int] = infos[0][4][:2]
+        async with self._open_lock:
+            if not self.connected:
+                self._transport, _ = await loop.create_datagram_endpoint(
+                    lambda: _HubProtocol(self), local_addr=("0.0.0.0", 0)
+                )
+                _LOGGER.debug("UDP hub socket open on port %s", self._transport.get_extra_info("sockname")[1])
+        other = self._routes.get(addr)
+        if other is not None and other is not endpoint:
+            _LOGGER.warning(
+                "%s:%s and %s:%s resolve to the same address; replies go to the latter",
+                other.host, other.port, endpoint.host, endpoint.port,
+            )
+        self._routes[addr] = endpoint
+        return addr
+
+    def _detach(self, endpoint: HubEndpoint, addr: tuple[str, int]) -> None:
+        if self._routes.get(addr) is endpoint:
+            del self._routes[addr]
+        if not self._routes and self._transport is not None:
+            self._transport.close()
+            self._transport = None
+            _LOGGER.debug("UDP hub socket closed")
+
+    def _sendto(self, data: bytes, addr: tuple[str, int]) -> bool:
+        if not self.connected:
+            return False
+        self._transport.sendto(data, addr)
+        return True
+
+    # ---------- Protocol callbacks ----------
+    def _datagram_received(self, data: bytes, addr) -> None:
+        endpoint = self._routes.get(addr[:2])
+        if endpoint is None:
+            _LOGGER.debug("Datagram from unknown address %s: %s", addr, data.hex())
+            return
+        if endpoint.on_receive is not None:
+            endpoint.on_receive(data)
+
+    def _connection_lost(self, transport: asyncio.BaseTransport | None, exc: Exception | None) -> None:
+        if exc is not None:
+            _LOGGER.debug("UDP hub socket lost: %s", exc)
+        # Endpoints see connected == False and reattach (reopening the socket) on their next send
+        if transport is self._transport:
+            self._transport = None
+
+
+class HubEndpoint:
+    """One tower's view of the shared hub socket; a drop-in for PnsUdpTransport."""
+
+    stream = False
+
+    def __init__(self, hub: PnsUdpHub, host: str, port: int):
+        self.host = host
+        self.port = port
+        self.on_receive: Callable[[bytes], None] | None = None
+        self._hub = hub
+        self._addr: tuple[str, int] | None = None
+
+    @property
+    def connected(self) -> bool:
+        return self._addr is not None and self._hub.connected
+
+    async def async_open(self) -> None:
+        """Attach to the hub if not attached already. Raises OSError on failure."""
+        if self.connected:
+            return
+        self._addr = await self._hub._async_attach(self)
+
+    def send(self, data: bytes) -> bool:
+        """Queue one datagram to the tower. Returns False if not attached."""
+        if self._addr is None:
+            return False
+        return self._hub._sendto(data, self._addr)
+
+    def close(self) -> None:
+        if self._addr is not None:
+            self._hub._detach(self, self._addr)
+            self._addr = None
@@ -0,0 +1,153 @@
+from __future__ import annotations
+import asyncio
+import logging
+import time
+from typing import Any, Final
+
+import voluptuous as vol
+
+from homeassistant.const import CONF_HOST, CONF_PORT
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import config_validation as cv
+
+from .const import (
+    DOMAIN,
+    COLOR_MAP,
+    ATTR_TIERS,
+    ATTR_FLASH,
+    ATTR_BUZZER,
+    CONF_RULES,
+    CONF_SIGNAL,
+    CONF_VALUE,
+    CONF_TOWER,
+    CONF_SOURCES,
+    DEFAULT_INGEST_PORT,
+)
+from .device import PatliteTowerBase
+from .services import TIERS_SCHEMA
+from .stats import LatencyHistogram
+
+_LOGGER: Final = logging.getLogger(__name__)
+
+RULE_SCHEMA: Final = vol.All(
+    vol.Schema({
+        vol.Required(CONF_SIGNAL): cv.string,
+        vol.Optional(CONF_VALUE): cv.string,  # omitted: any value matches
+        vol.Required(CONF_TOWER): cv.string,
+        vol.Optional(ATTR_TIERS): TIERS_SCHEMA,
+        vol.Optional(ATTR_FLASH): cv.boolean,
+        vol.Optional(ATTR_BUZZER): vol.All(vol.Coerce(int), vol.Range(min=0x00, max=0x0B)),
+    }),
+    cv.has_at_least_one_key(ATTR_TIERS, ATTR_FLASH, ATTR_BUZZER),
+)
+
+INGEST_SCHEMA: Final = vol.Schema({
+    vol.Optional(CONF_HOST, default="0.0.0.0"): cv.string,
+    vol.Optional(CONF_PORT, default=DEFAULT_INGEST_PORT): cv.port,
+    vol.Optional(CONF_SOURCES, default=[]): vol.All(cv.ensure_list, [cv.string]),
+    vol.Required(CONF_RULES): vol.All(cv.ensure_list, [RULE_SCHEMA]),
+})
+
+
+class _IngestProtocol(asyncio.DatagramProtocol):
+    """Forward datagrams to the owning IngestListener."""
+
+    def __init__(self, listener: IngestListener):
+        self._listener = listener
+
+    def datagram_received(self, data: bytes, addr) -> None:
+        self._listener._datagram_received(data, addr)
+
+    def error_received(self, exc: Exception) -> None:
+        _LOGGER.debug("Ingest socket error: %s", exc)
+
+
+class IngestListener:
+    """UDP endpoint that turns PLC signals straight into tower states.
+
+    A datagram holds one or more lines of ``signal value`` (or
+    ``signal=value``). Each line is looked up in the rule table and the
+    matching states are applied to the towers with an immediate flush,
+    without going through the event bus, entities or services. The entities
+    still update from the device, so the change shows in HA state.
+    ``latency`` covers signal receipt to the tower's ACK.
+    """
+
+    def __init__(self, hass: HomeAssistant, rules: list[dict[str, Any]], sources: list[str] = ()):
+        self._hass = hass
+        self._sources = frozenset(sources)
+        self._rules: dict[str, list[dict[str, Any]]] = {}
+        for rule in rules:
+            self._rules.setdefault(rule[CONF_SIGNAL], []).append({
+                CONF_VALUE: rule.get(CONF_VALUE),
+                CONF_TOWER: rule[CONF_TOWER],
+                # Same shape as async_set_state takes, converted once here
+                ATTR_TIERS: {tier - 1: COLOR_MAP[option] for tier, option in rule.get(ATTR_TIERS, {}).items()},
+                ATTR_FLASH: rule.get(ATTR_FLASH),
+                ATTR_BUZZER: rule.get(ATTR_BUZZER),
+            })
+        self._transport: asyncio.DatagramTransport | None = None
+        self._tasks: set[asyncio.Task] = set()
+        self.received = 0
+        self.unmatched = 0
+        self.latency = LatencyHistogram()
+
+    async def async_start(self, host: str, port: int) -> None:
+        """Bind the socket. Raises OSError if the port is taken."""
+        loop = asyncio.get_running_loop()
+        self._transport, _ = await loop.create_datagram_endpoint(
+            lambda: _IngestProtocol(self), local_addr=(host, port)
+        )
+        _LOGGER.debug("Listening for signals on %s:%s (%d rules)", host, port, len(self._rules))
+        if not self._sources:
+            _LOGGER.warning(
+                "Signal ingest on %s:%s accepts datagrams from any address; anyone who can reach "
+                "it can set towers and sound buzzers. List the PLCs under 'sources' to restrict it",
+                host, port,
+            )
+
+    def close(self) -> None:
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
+        for task in self._tasks:
+            task.cancel()
+
+    def as_dict(self) -> dict[str, Any]:
+        return {"received": self.received, "unmatched": self.unmatched, "latency": self.latency.as_dict()}
+
+    def _towers(self, ref: str) -> list[PatliteTowerBase]:
+        return [
+            data["device"] for data in self._hass.data.get(DOMAIN, {}).values()
+            if ref in (data["device"].uid, data["device"].name, getattr(data["device"], "host", None))
+        ]
+
+    def _datagram_received(self, data: bytes, addr) -> None:
+        start = time.perf_counter()
+        if self._sources and addr[0] not in self._sources:
+            _LOGGER.debug("Signal from %s ignored: not in sources", addr[0])
+            return
+        loop = asyncio.get_running_loop()
+        for line in data.decode("ascii", "replace").splitlines():
+            signal, _, value = line.strip().replace("=", " ", 1).partition(" ")
+            if not signal:
+                continue
+            self.received += 1
+            value = value.strip()
+            matched = False
+            for rule in self._rules.get(signal, ()):
+                if rule[CONF_VALUE] is not None and rule[CONF_VALUE] != value:
+                    continue
+                matched = True
+                for tower in self._towers(rule[CONF_TOWER]):
+                    tower.note_origin(f"signal {signal}={value} from {addr[0]}")
+                    task = loop.create_task(self._async_apply(tower, rule, start))
+                    self._tasks.add(task)
+                    task.add_done_callback(self._tasks.discard)
+            if not matched:
+                self.unmatched += 1
+                _LOGGER.debug("No rule for signal %s=%s", signal, value)
+
+    async def _async_apply(self, tower: PatliteTowerBase, rule: dict[str, Any], start: float) -> None:
+        await tower.async_set_state(rule[ATTR_TIERS], rule[ATTR_FLASH], rule[ATTR_BUZZER], flush=True)
+        self.latency.observe((time.perf_counter() - start) * 1000)
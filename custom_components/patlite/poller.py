@@ -0,0 +1,142 @@
+from __future__ import annotations
+import asyncio
+import heapq
+import itertools
+import logging
+import random
+import time
+from typing import Final
+
+from .const import POLL_FAST_INTERVAL_S, POLL_FAST_PERIOD_S, POLL_JITTER
+from .device import PatliteDevice
+from .protocol import PnsError, PnsNakError
+
+_LOGGER: Final = logging.getLogger(__name__)
+
+
+class PollScheduler:
+    """Run every tower's status polls off one timer.
+
+    Instead of one sleeping task per tower, due times sit in a heap and a
+    single loop timer is armed for the earliest one; a poll only has a task
+    while it is actually talking to the tower.
+    """
+
+    def __init__(self):
+        self._heap: list[tuple[float, int, StatusPoller]] = []
+        self._token: dict[StatusPoller, int] = {}  # the heap entry still valid per poller
+        self._seq = itertools.count()
+        self._handle: asyncio.TimerHandle | None = None
+
+    def schedule(self, poller: StatusPoller, delay: float) -> None:
+        """(Re)schedule ``poller`` to run in ``delay`` seconds; replaces its earlier due time."""
+        loop = asyncio.get_running_loop()
+        token = next(self._seq)
+        self._token[poller] = token
+        heapq.heappush(self._heap, (loop.time() + delay, token, poller))
+        self._arm()
+
+    def cancel(self, poller: StatusPoller) -> None:
+        # Its heap entry is skipped when it comes up
+        if self._token.pop(poller, None) is not None:
+            self._arm()
+
+    def _arm(self) -> None:
+        heap = self._heap
+        while heap and self._token.get(heap[0][2]) != heap[0][1]:
+            heapq.heappop(heap)  # stale: rescheduled or cancelled
+        if not heap:
+            if self._handle is not None:
+                self._handle.cancel()
+                self._handle = None
+            return
+        when = heap[0][0]
+        if self._handle is not None:
+            if self._handle.when() == when:
+                return
+            self._handle.cancel()
+        self._handle = asyncio.get_running_loop().call_at(when, self._fire)
+
+    def _fire(self) -> None:
+        self._handle = None
+        now = asyncio.get_running_loop().time()
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            _, token, poller = heapq.heappop(heap)
+            if self._token.get(poller) == token:
+                del self._token[poller]
+                poller._due()
+        self._arm()
+
+
+class StatusPoller:
+    """Periodically read a tower's state back into its PatliteDevice.
+
+    Polls every ``idle_interval`` seconds, or every ``fast_interval`` for
+    ``fast_period`` seconds after a local write. Every interval is jittered
+    and the first poll is delayed randomly, so a fleet does not poll in
+    lockstep. Timing is left to the shared PollScheduler.
+    """
+
+    def __init__(
+        self,
+        device: PatliteDevice,
+        scheduler: PollScheduler,
+        idle_interval: float,
+        fast_interval: float = POLL_FAST_INTERVAL_S,
+        fast_period: float = POLL_FAST_PERIOD_S,
+    ):
+        self._device = device
+        self._scheduler = scheduler
+        self._idle = idle_interval
+        self._fast = min(fast_interval, idle_interval)
+        self._fast_period = fast_period
+        self._task: asyncio.Task | None = None
+        self._running = False
+
+    def start(self) -> None:
+        if not self._running:
+            self._running = True
+            self._device.on_write = self._on_write
+            self._scheduler.schedule(self, random.uniform(0, self._idle))
+
+    def stop(self) -> None:
+        self._running = False
+        if self._device.on_write == self._on_write:
+            self._device.on_write = None
+        self._scheduler.cancel(self)
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def _jittered(self, base: float) -> float:
+        return base * random.uniform(1 - POLL_JITTER, 1 + POLL_JITTER)
+
+    def _next_delay(self) -> float:
+        since_write = time.monotonic() - self._device.last_write
+        return self._jittered(self._fast if since_write < self._fast_period else self._idle)
+
+    def _on_write(self) -> None:
+        # Restart on the fast schedule; a poll in progress reschedules itself when done
+        if self._task is None:
+            self._scheduler.schedule(self, self._jittered(self._fast))
+
+    def _due(self) -> None:
+        self._task = asyncio.get_running_loop().create_task(self._async_poll())
+
+    async def _async_poll(self) -> None:
+        try:
+            await self._device.async_refresh_status()
+        except PnsNakError:
+            _LOGGER.info(
+                "Patlite %s:%s does not support status reads; polling disabled",
+                self._device.host, self._device.port,
+            )
+            self._task = None
+            self.stop()
+            return
+        except PnsError as exc:
+            _LOGGER.debug("Status poll failed: %s", exc)
+        self._task = None
+        if self._running:
+            self._scheduler.schedule(self, self._next_delay())
@@ -0,0 +1,212 @@
+from __future__ import annotations
+import asyncio
+import logging
+import time
+from typing import Final, Callable
+
+from .const import UDP_TIMEOUT_S, ACK_RETRIES, RETRY_BACKOFF_S, RETRY_BACKOFF_MAX_S
+from .stats import DeliveryStats
+from .trace import FrameTrace, TX, RX
+from .hub import HubEndpoint
+from .transport import PnsUdpTransport, PnsTcpTransport
+
+_LOGGER: Final = logging.getLogger(__name__)
+
+# Single-byte replies to PNS control commands
+PNS_ACK: Final = 0x06
+PNS_NAK: Final = 0x15
+# Stream reassembly: when a reply could be complete but a longer form of it
+# (e.g. a status reply with its mode byte) may still be arriving, wait this long
+_STREAM_SETTLE_S: Final = 0.02
+
+
+class PnsError(Exception):
+    """Base class for PNS delivery failures."""
+
+
+class PnsTimeoutError(PnsError):
+    """The tower did not answer, even after retries."""
+
+
+class PnsNakError(PnsError):
+    """The tower answered NAK (command rejected)."""
+
+
+class PnsRequestEngine:
+    """Request/response matching on top of a PNS transport.
+
+    PNS replies carry no sequence number, so only one command is outstanding
+    at a time and the next reply from the tower answers it. Unanswered
+    commands are resent with bounded exponential backoff.
+
+    Over TCP the reply is reassembled from the byte stream, and a connection
+    that stays silent for a whole timeout is treated as half-open: it is
+    dropped and the retry goes out on a fresh connection.
+    """
+
+    def __init__(
+        self,
+        transport: PnsUdpTransport | PnsTcpTransport | HubEndpoint,
+        stats: DeliveryStats | None = None,
+        timeout: float = UDP_TIMEOUT_S,
+        retries: int = ACK_RETRIES,
+    ):
+        self._transport = transport
+        self.stats = stats if stats is not None else DeliveryStats()
+        self.timeout = timeout
+        self.retries = retries
+        self._lock = asyncio.Lock()
+        self._pending: asyncio.Future[bytes] | None = None
+        self._match: Callable[[bytes], bool] | None = None
+        self._sizes: tuple[int, ...] = (1,)  # lengths the pending reply can have
+        self._rx = bytearray()  # partial reply (stream transports)
+        self._settle: asyncio.TimerHandle | None = None
+        self.trace: FrameTrace | None = None  # set while frame tracing is on
+        transport.on_receive = self._on_receive
+        if transport.stream:
+            transport.on_lost = self._on_lost
+
+    async def async_request(
+        self,
+        frame: bytes,
+        match: Callable[[bytes], bool] | None = None,
+        origin: str | None = None,
+        sizes: tuple[int, ...] = (1,),
+    ) -> bytes:
+        """Send ``frame`` and return the raw reply. Raises PnsTimeoutError.
+
+        ``match`` filters which datagrams count as the reply, so a late answer
+        to an earlier command of another kind is not mistaken for this one.
+        ``origin`` (what caused the frame) only goes into the trace.
+        ``sizes`` are the lengths the reply can have; streams use them to
+        cut the reply out of the byte stream.
+        """
+        async with self._lock:
+            loop = asyncio.get_running_loop()
+            stats = self.stats
+            transport = self._transport
+            for attempt in range(self.retries + 1):
+                if attempt:
+                    stats.retried += 1
+                    await asyncio.sleep(min(RETRY_BACKOFF_S * 2 ** (attempt - 1), RETRY_BACKOFF_MAX_S))
+                if transport.stream and not transport.connected:
+                    try:
+                        await transport.async_open()
+                    except OSError as exc:
+                        _LOGGER.debug("%s (attempt %d/%d)", exc, attempt + 1, self.retries + 1)
+                        continue
+                fut: asyncio.Future[bytes] = loop.create_future()
+                self._pending = fut
+                self._match = match
+                self._sizes = sizes
+                self._rx.clear()
+                start = time.monotonic()
+                try:
+                    if not transport.send(frame):
+                        raise PnsError(f"Transport to {transport.host}:{transport.port} is closed")
+                    stats.sent += 1
+                    if self.trace is not None:
+                        self.trace.record(TX, frame, origin)
+                    reply = await asyncio.wait_for(fut, self.timeout)
+                except asyncio.TimeoutError:
+                    _LOGGER.debug(
+                        "No reply from %s:%s (attempt %d/%d)",
+                        transport.host, transport.port, attempt + 1, self.retries + 1,
+                    )
+                    if transport.stream:
+                        transport.reset()
+                    continue
+                except ConnectionError as exc:
+                    _LOGGER.debug("%s (attempt %d/%d)", exc, attempt + 1, self.retries + 1)
+                    continue
+                finally:
+                    self._pending = None
+                    self._match = None
+                    self._cancel_settle()
+                stats.latency.observe((time.monotonic() - start) * 1000)
+                return reply
+            stats.timed_out += 1
+            raise PnsTimeoutError(
+                f"No reply from {transport.host}:{transport.port} after {self.retries + 1} attempts"
+            )
+
+    async def async_command(self, frame: bytes, origin: str | None = None) -> None:
+        """Send a control command and wait for ACK. Raises PnsNakError on NAK."""
+        reply = await self.async_request(frame, _is_ack_or_nak, origin)
+        if reply[:1] == bytes([PNS_ACK]):
+            self.stats.acked += 1
+            self.stats.last_ack = time.monotonic()
+            return
+        self.stats.nacked += 1
+        raise PnsNakError(f"Tower {self._transport.host}:{self._transport.port} rejected frame: reply={reply.hex()}")
+
+    def _on_receive(self, data: bytes) -> None:
+        if self.trace is not None:
+            self.trace.record(RX, data)
+        if self._transport.stream and self._pending is not None:
+            # TCP may split a reply or glue it to the next one
+            self._rx += data
+            self._cancel_settle()
+            reply = self._take_reply(final=False)
+            if reply is None:
+                return  # wait for the rest of the reply
+            data = reply
+        self._deliver(data)
+
+    def _take_reply(self, final: bool) -> bytes | None:
+        """Cut the pending reply off the front of the stream buffer; None = not complete yet."""
+        rx = self._rx
+        match = self._match or _is_ack_or_nak
+        fits = [n for n in self._sizes if n <= len(rx) and match(bytes(rx[:n]))]
+        if fits:
+            size = max(fits)
+            if (
+                not final
+                and len(rx) == size
+                and any(n > size for n in self._sizes)
+                and bytes(rx) != bytes([PNS_NAK])
+            ):
+                # Looks complete, but may be the start of a longer reply
+                self._settle = asyncio.get_running_loop().call_later(_STREAM_SETTLE_S, self._settled)
+                return None
+            reply = bytes(rx[:size])
+            del rx[:size]
+            return reply
+        if len(rx) <= max(self._sizes):
+            return None
+        # Matches no reply form: hand it over whole to be logged as stray
+        reply = bytes(rx)
+        rx.clear()
+        return reply
+
+    def _settled(self) -> None:
+        self._settle = None
+        if self._pending is not None:
+            reply = self._take_reply(final=True)
+            if reply is not None:
+                self._deliver(reply)
+
+    def _cancel_settle(self) -> None:
+        if self._settle is not None:
+            self._settle.cancel()
+            self._settle = None
+
+    def _deliver(self, data: bytes) -> None:
+        fut = self._pending
+        if fut is None or fut.done() or (self._match is not None and not self._match(data)):
+            # Late reply to an attempt we already gave up on
+            _LOGGER.debug("Stray reply from %s:%s: %s", self._transport.host, self._transport.port, data.hex())
+            return
+        fut.set_result(data)
+
+    def _on_lost(self) -> None:
+        # Fail the outstanding attempt now instead of waiting out its timeout
+        fut = self._pending
+        if fut is not None and not fut.done():
+            fut.set_exception(ConnectionResetError(
+                f"Connection to {self._transport.host}:{self._transport.port} lost"
+            ))
+
+
+def _is_ack_or_nak(data: bytes) -> bool:
+    return len(data) == 1 and data[0] in (PNS_ACK, PNS_NAK)
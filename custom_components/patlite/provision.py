@@ -0,0 +1,116 @@
+from __future__ import annotations
+import asyncio
+import csv
+import logging
+import time
+from typing import Any, Final
+
+import voluptuous as vol
+
+from homeassistant.components import persistent_notification
+from homeassistant.config_entries import SOURCE_IMPORT
+from homeassistant.const import CONF_HOST, CONF_PORT, CONF_NAME, CONF_TYPE
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import config_validation as cv
+
+from .const import (
+    DOMAIN,
+    UDP_PORT_DEFAULT,
+    CONF_TRANSPORT,
+    TRANSPORT_UDP,
+    TRANSPORT_TCP,
+    TCP_CONNECT_TIMEOUT_S,
+    CONF_AREA,
+    ENTRY_TYPE_GROUP,
+    SCAN_CONCURRENCY,
+    IMPORT_TIMEOUT_S,
+)
+from .discovery import async_probe
+
+_LOGGER: Final = logging.getLogger(__name__)
+
+TOWER_SCHEMA: Final = vol.Schema({
+    vol.Required(CONF_HOST): cv.string,
+    vol.Optional(CONF_PORT, default=UDP_PORT_DEFAULT): cv.port,
+    vol.Optional(CONF_NAME): cv.string,
+    vol.Optional(CONF_AREA): cv.string,
+    vol.Optional(CONF_TRANSPORT, default=TRANSPORT_UDP): vol.In([TRANSPORT_UDP, TRANSPORT_TCP]),
+})
+
+
+def load_csv(path: str) -> list[dict[str, Any]]:
+    """Towers from a CSV file with a header row: host, port, name, area, transport.
+
+    Only ``host`` is required; empty cells take the defaults. Rows that do
+    not validate are logged and left out. Runs in the executor.
+    """
+    towers = []
+    with open(path, newline="", encoding="utf-8") as fp:
+        for line, row in enumerate(csv.DictReader(fp), start=2):
+            row = {k.strip().lower(): v.strip() for k, v in row.items() if k and v and v.strip()}
+            if not row:
+                continue
+            try:
+                towers.append(TOWER_SCHEMA(row))
+            except vol.Invalid as exc:
+                _LOGGER.error("%s line %d: %s", path, line, exc)
+    return towers
+
+
+async def async_provision(hass: HomeAssistant, towers: list[dict[str, Any]]) -> None:
+    """Create a config entry for every reachable tower not configured yet.
+
+    All towers are probed at once (bounded by SCAN_CONCURRENCY), then the
+    entries are created together; unreachable towers are reported in a
+    notification and picked up on the next start once they answer.
+    """
+    configured = {
+        (entry.data[CONF_HOST], int(entry.data[CONF_PORT]))
+        for entry in hass.config_entries.async_entries(DOMAIN)
+        if entry.data.get(CONF_TYPE) != ENTRY_TYPE_GROUP
+    }
+    todo: dict[tuple[str, int], dict[str, Any]] = {}
+    for tower in towers:
+        key = (tower[CONF_HOST], tower[CONF_PORT])
+        if key not in configured:
+            todo.setdefault(key, tower)
+    if not todo:
+        return
+
+    start = time.monotonic()
+    udp = [key for key, tower in todo.items() if tower[CONF_TRANSPORT] == TRANSPORT_UDP]
+    tcp = [key for key, tower in todo.items() if tower[CONF_TRANSPORT] == TRANSPORT_TCP]
+    slots = asyncio.Semaphore(SCAN_CONCURRENCY)
+    reachable, tcp_results = await asyncio.gather(
+        async_probe(udp, SCAN_CONCURRENCY, IMPORT_TIMEOUT_S),
+        asyncio.gather(*(_async_tcp_reachable(host, port, slots) for host, port in tcp)),
+    )
+    reachable |= {key for key, ok in zip(tcp, tcp_results) if ok}
+
+    await asyncio.gather(*(
+        hass.config_entries.flow.async_init(DOMAIN, context={"source": SOURCE_IMPORT}, data=todo[key])
+        for key in todo if key in reachable
+    ))
+    unreachable = [f"{host}:{port}" for host, port in todo if (host, port) not in reachable]
+    _LOGGER.info(
+        "Imported %d of %d towers in %.2f s", len(todo) - len(unreachable), len(todo), time.monotonic() - start
+    )
+    if unreachable:
+        _LOGGER.warning("Towers not reachable, not imported: %s", ", ".join(unreachable))
+        persistent_notification.async_create(
+            hass,
+            "These towers did not answer and were not added; they are tried again on the next "
+            "start:\n\n" + "\n".join(f"- {t}" for t in unreachable),
+            title="Patlite import",
+            notification_id=f"{DOMAIN}_import",
+        )
+
+
+async def _async_tcp_reachable(host: str, port: int, slots: asyncio.Semaphore) -> bool:
+    async with slots:
+        try:
+            _reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), TCP_CONNECT_TIMEOUT_S)
+        except (asyncio.TimeoutError, OSError):
+            return False
+        writer.close()
+        return True
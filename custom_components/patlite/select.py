@@ -1,33 +1,33 @@
 from __future__ import annotations
-from typing import Any, Callable
+from typing import Any
 
 from homeassistant.components.select import SelectEntity
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.restore_state import RestoredExtraData
 from homeassistant.config_entries import ConfigEntry
 
 from .const import DOMAIN, COLOR_MAP, INV_COLOR_MAP, NUM_TIERS
-from .device import PatliteDevice
+from .device import PatliteTowerBase, tier_key
+from .entity import PatliteEntity
 
 OPTIONS = list(COLOR_MAP.keys())
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback) -> None:
-    device: PatliteDevice = hass.data[DOMAIN][entry.entry_id]["device"]
+    device: PatliteTowerBase = hass.data[DOMAIN][entry.entry_id]["device"]
     entities = [PatliteTierSelect(device, tier=i) for i in range(NUM_TIERS)]
     async_add_entities(entities)
 
 
-class PatliteTierSelect(SelectEntity):
+class PatliteTierSelect(PatliteEntity, SelectEntity):
     _attr_icon = "mdi:palette"
-    def __init__(self, device: PatliteDevice, tier: int):
-        self._device = device
+    def __init__(self, device: PatliteTowerBase, tier: int):
+        super().__init__(device, tier_key(tier))
         self._tier = tier
-        self._attr_name = f"Patlite Tier {tier+1} Color"
-        self._attr_unique_id = f"{device.host}:{device.port}-tier{tier}-color"
+        self._attr_name = f"{device.name_prefix} Tier {tier+1} Color"
+        self._attr_unique_id = f"{device.uid}-tier{tier}-color"
         self._attr_options = OPTIONS
-        self._attr_should_poll = False
-        self._unsub: Callable[[], None] | None = None
 
     @property
     def current_option(self) -> str | None:
@@ -38,34 +38,22 @@ class PatliteTierSelect(SelectEntity):
         return INV_COLOR_MAP.get(code, "Off")
 
     @property
-    def device_info(self) -> dict[str, Any]:
-        return {
-            "identifiers": {(DOMAIN, f"{self._device.host}:{self._device.port}")},
-            "manufacturer": "Patlite",
-            "name": f"Patlite @ {self._device.host}",
-            "model": "UDP Tower",
-        }
+    def extra_restore_state_data(self) -> RestoredExtraData:
+        # The last colour survives a restart even while the tier is off
+        return RestoredExtraData({"last_color": self._device.get_last_color_code(self._tier)})
+
+    def _restore(self, data: dict[str, Any]) -> None:
+        if data.get("last_color") in INV_COLOR_MAP:
+            self._device.restore(tier=self._tier, last_color=data["last_color"])
 
     async def async_select_option(self, option: str) -> None:
         if option not in COLOR_MAP:
             raise ValueError(f"Invalid color option: {option}")
+        self._note_origin()
         if option == "Off":
             # Power off but do not overwrite the last chosen color
-            self._device.set_tier_power(self._tier, False)
+            await self._device.async_set_tier_power(self._tier, False)
         else:
             code = COLOR_MAP[option]
-            self._device.set_tier_color(self._tier, code)
-            self._device.set_tier_power(self._tier, True)
-        self.async_write_ha_state()
-
-    async def async_added_to_hass(self) -> None:
-        self._unsub = self._device.add_listener(self._device_updated)
-
-    async def async_will_remove_from_hass(self) -> None:
-        if self._unsub:
-            self._unsub()
-            self._unsub = None
-
-    def _device_updated(self) -> None:
-        # called from driver; schedule HA state refresh
-        self.schedule_update_ha_state()
\ No newline at end of file
+            await self._device.async_set_tier_color(self._tier, code)
+            await self._device.async_set_tier_power(self._tier, True)
@@ -0,0 +1,224 @@
+from __future__ import annotations
+import logging
+from datetime import timedelta
+from typing import Any, Final
+
+from homeassistant.components.sensor import SensorEntity, SensorEntityDescription, SensorStateClass
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory, UnitOfTime
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.device_registry import DeviceEntryType
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity, DataUpdateCoordinator
+
+from .const import DOMAIN, SENSOR_INTERVAL_S, DATA_FLEET_SENSORS
+from .device import PatliteDevice, PatliteTowerBase
+from .entity import tower_device_info
+from .stats import StatsWindow
+
+_LOGGER: Final = logging.getLogger(__name__)
+
+_RATE = "commands/s"
+
+# Keys match StatsWindow.sample()
+TOWER_SENSORS: Final = (
+    SensorEntityDescription(
+        key="commands_per_s", name="Commands", native_unit_of_measurement=_RATE,
+        state_class=SensorStateClass.MEASUREMENT, icon="mdi:speedometer",
+    ),
+    SensorEntityDescription(
+        key="latency_p50_ms", name="Latency p50", native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT, icon="mdi:timer-outline",
+    ),
+    SensorEntityDescription(
+        key="latency_p99_ms", name="Latency p99", native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT, icon="mdi:timer-alert-outline",
+    ),
+    SensorEntityDescription(
+        key="timeouts", name="Timeouts", state_class=SensorStateClass.TOTAL_INCREASING, icon="mdi:timer-off-outline",
+    ),
+    SensorEntityDescription(
+        key="coalesced", name="Coalesced changes", state_class=SensorStateClass.TOTAL_INCREASING,
+        icon="mdi:call-merge",
+    ),
+    SensorEntityDescription(
+        key="suppressed", name="Suppressed frames", state_class=SensorStateClass.TOTAL_INCREASING,
+        icon="mdi:filter-remove-outline",
+    ),
+    SensorEntityDescription(
+        key="last_ack_age_s", name="Last ACK age", native_unit_of_measurement=UnitOfTime.SECONDS,
+        state_class=SensorStateClass.MEASUREMENT, icon="mdi:clock-check-outline",
+    ),
+    SensorEntityDescription(
+        key="fanout_ms", name="Listener fan-out", native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT, icon="mdi:source-branch",
+    ),
+)
+
+# Keys match _FleetCoordinator._async_sample()
+FLEET_SENSORS: Final = (
+    SensorEntityDescription(
+        key="commands_per_s", name="Commands", native_unit_of_measurement=_RATE,
+        state_class=SensorStateClass.MEASUREMENT, icon="mdi:speedometer",
+    ),
+    SensorEntityDescription(
+        key="latency_p99_ms", name="Worst latency p99", native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT, icon="mdi:timer-alert-outline",
+    ),
+    SensorEntityDescription(
+        key="timeouts", name="Timeouts", state_class=SensorStateClass.TOTAL_INCREASING, icon="mdi:timer-off-outline",
+    ),
+    SensorEntityDescription(
+        key="unavailable", name="Unavailable towers", state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:lan-disconnect",
+    ),
+)
+
+_FLEET_DEVICE_INFO: Final = {
+    "identifiers": {(DOMAIN, "fleet")},
+    "manufacturer": "Patlite",
+    "name": "Patlite fleet",
+    "entry_type": DeviceEntryType.SERVICE,
+}
+
+
+async def async_setup_entry(
+    hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
+) -> None:
+    device: PatliteTowerBase = hass.data[DOMAIN][entry.entry_id]["device"]
+    if not isinstance(device, PatliteDevice):
+        return  # groups send through their members, which have their own sensors
+    coordinator = _TowerCoordinator(hass, device)
+    async_add_entities([
+        PatliteStatSensor(coordinator, description, tower_device_info(device), device.uid)
+        for description in TOWER_SENSORS
+    ])
+
+    if DATA_FLEET_SENSORS not in hass.data:
+        hass.data[DATA_FLEET_SENSORS] = _FleetSensors(hass)
+    fleet: _FleetSensors = hass.data[DATA_FLEET_SENSORS]
+    fleet.register(entry.entry_id, async_add_entities)
+
+    @callback
+    def _unregister() -> None:
+        fleet.unregister(entry.entry_id)
+
+    entry.async_on_unload(_unregister)
+
+
+class _FleetSensors:
+    """Keeps the fleet sensors on exactly one loaded tower entry.
+
+    Entities need a config entry, and there is none for the fleet: the
+    sensors live on one tower entry and move to another when it unloads,
+    so they exist for as long as any tower is loaded.
+    """
+
+    def __init__(self, hass: HomeAssistant):
+        self.coordinator = _FleetCoordinator(hass)
+        self._adders: dict[str, AddEntitiesCallback] = {}
+        self._owner: str | None = None
+
+    @callback
+    def register(self, entry_id: str, add_entities: AddEntitiesCallback) -> None:
+        self._adders[entry_id] = add_entities
+        if self._owner is None:
+            self._adopt(entry_id)
+
+    @callback
+    def unregister(self, entry_id: str) -> None:
+        # The owner's platform has removed its entities by now
+        self._adders.pop(entry_id, None)
+        if self._owner == entry_id:
+            self._owner = None
+            if self._adders:
+                self._adopt(next(iter(self._adders)))
+
+    def _adopt(self, entry_id: str) -> None:
+        self._owner = entry_id
+        self._adders[entry_id]([
+            PatliteStatSensor(self.coordinator, description, _FLEET_DEVICE_INFO, "fleet")
+            for description in FLEET_SENSORS
+        ])
+
+
+class _TowerCoordinator(DataUpdateCoordinator[dict[str, Any]]):
+    """Samples one tower's counters every SENSOR_INTERVAL_S, never per frame.
+
+    Coordinators only run while an entity listens, so with the sensors
+    disabled (the default) nothing is sampled at all.
+    """
+
+    def __init__(self, hass: HomeAssistant, device: PatliteDevice):
+        super().__init__(
+            hass, _LOGGER, name=f"{device.name} stats", update_interval=timedelta(seconds=SENSOR_INTERVAL_S)
+        )
+        self._device = device
+        self._window = StatsWindow()
+
+    async def _async_update_data(self) -> dict[str, Any]:
+        return self._window.sample(self._device.stats, self._device.fanout)
+
+
+class _FleetCoordinator(DataUpdateCoordinator[dict[str, Any]]):
+    """Aggregates every loaded tower; towers come and go with their entries."""
+
+    def __init__(self, hass: HomeAssistant):
+        super().__init__(
+            hass, _LOGGER, name="Patlite fleet stats", update_interval=timedelta(seconds=SENSOR_INTERVAL_S)
+        )
+        # Per tower: the device object seen last (a reload brings a new one with
+        # fresh counters), its window and its timeout count at the last sample
+        self._towers: dict[str, tuple[PatliteDevice, StatsWindow, int]] = {}
+        # Only ever grows, unlike a sum over the towers loaded right now
+        self._timeouts = 0
+
+    async def _async_update_data(self) -> dict[str, Any]:
+        devices = [
+            data["device"] for data in self.hass.data.get(DOMAIN, {}).values()
+            if isinstance(data.get("device"), PatliteDevice)
+        ]
+        towers: dict[str, tuple[PatliteDevice, StatsWindow, int]] = {}
+        samples = []
+        for device in devices:
+            seen = self._towers.get(device.uid)
+            if seen is None or seen[0] is not device:
+                seen = (device, StatsWindow(), 0)
+            sample = seen[1].sample(device.stats, device.fanout)
+            self._timeouts += sample["timeouts"] - seen[2]
+            towers[device.uid] = (device, seen[1], sample["timeouts"])
+            samples.append(sample)
+        self._towers = towers
+        p99 = [s["latency_p99_ms"] for s in samples if s["latency_p99_ms"] is not None]
+        return {
+            "commands_per_s": round(sum(s["commands_per_s"] for s in samples), 2),
+            "latency_p99_ms": max(p99) if p99 else None,
+            "timeouts": self._timeouts,
+            "unavailable": sum(1 for device in devices if not device.available),
+        }
+
+
+class PatliteStatSensor(CoordinatorEntity, SensorEntity):
+    """One figure from a stats coordinator; diagnostic and disabled by default."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(
+        self,
+        coordinator: DataUpdateCoordinator[dict[str, Any]],
+        description: SensorEntityDescription,
+        device_info: dict[str, Any],
+        uid: str,
+    ):
+        super().__init__(coordinator)
+        self.entity_description = description
+        self._attr_device_info = device_info
+        self._attr_name = f"{device_info['name']} {description.name}"
+        self._attr_unique_id = f"{uid}-stat-{description.key}"
+
+    @property
+    def native_value(self) -> Any:
+        if self.coordinator.data is None:
+            return None
+        return self.coordinator.data.get(self.entity_description.key)
@@ -0,0 +1,79 @@
+from __future__ import annotations
+import asyncio
+import logging
+from typing import Final, Callable, NamedTuple, Sequence
+
+_LOGGER: Final = logging.getLogger(__name__)
+
+
+class SequenceStep(NamedTuple):
+    frame: bytes  # complete PNS frame, built once up front
+    duration: float  # seconds to hold it
+
+
+class SequencePlayer:
+    """Play precomputed frames on a drift-free schedule.
+
+    Step deadlines are absolute (start + sum of previous durations on the
+    loop's monotonic clock), so callback lateness never accumulates. If the
+    loop falls more than a whole step behind, the schedule restarts from now
+    instead of bursting to catch up.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[bytes], None],
+        steps: Sequence[SequenceStep],
+        repeat: int = 1,
+        on_done: Callable[[], None] | None = None,
+    ):
+        if not steps:
+            raise ValueError("A sequence needs at least one step")
+        self._send = send
+        self._steps = tuple(steps)
+        self._repeat = repeat  # 0 = until stopped
+        self._on_done = on_done
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._handle: asyncio.TimerHandle | None = None
+        self._next_at = 0.0
+        self._index = 0
+        self._round = 0
+
+    @property
+    def running(self) -> bool:
+        return self._handle is not None
+
+    def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._next_at = self._loop.time()
+        self._play()
+
+    def cancel(self) -> None:
+        """Stop without calling ``on_done``."""
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+
+    def _play(self) -> None:
+        step = self._steps[self._index]
+        self._send(step.frame)
+
+        now = self._loop.time()
+        if now - self._next_at > step.duration:
+            _LOGGER.debug("Sequence fell %.3fs behind; resyncing", now - self._next_at)
+            self._next_at = now
+        self._next_at += step.duration
+
+        self._index += 1
+        if self._index == len(self._steps):
+            self._index = 0
+            self._round += 1
+            if self._repeat and self._round >= self._repeat:
+                self._handle = self._loop.call_at(self._next_at, self._finish)
+                return
+        self._handle = self._loop.call_at(self._next_at, self._play)
+
+    def _finish(self) -> None:
+        self._handle = None
+        if self._on_done is not None:
+            self._on_done()
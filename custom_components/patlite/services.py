@@ -0,0 +1,235 @@
+from __future__ import annotations
+import asyncio
+import logging
+from typing import Final
+
+import voluptuous as vol
+
+from homeassistant.const import ATTR_DEVICE_ID
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse, callback
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv, device_registry as dr
+
+from .const import (
+    DOMAIN,
+    COLOR_MAP,
+    NUM_TIERS,
+    SERVICE_PLAY_SEQUENCE,
+    SERVICE_STOP_SEQUENCE,
+    ATTR_STEPS,
+    ATTR_TIERS,
+    ATTR_FLASH,
+    ATTR_BUZZER,
+    ATTR_DURATION,
+    ATTR_REPEAT,
+    ATTR_RESTORE,
+    SERVICE_SET_STATE,
+    SERVICE_CLAIM,
+    SERVICE_RELEASE,
+    ATTR_SOURCE,
+    ATTR_PRIORITY,
+    ATTR_TTL,
+    SERVICE_SNAPSHOT,
+    SERVICE_RESTORE_SNAPSHOT,
+    ATTR_SNAPSHOT_ID,
+    DEFAULT_SNAPSHOT_ID,
+    SERVICE_EXPORT_TRACE,
+    ATTR_FORMAT,
+    TRACE_FORMATS,
+)
+from .device import PatliteDevice, PatliteTowerBase, build_frame
+from .group import PatliteGroup
+from .sequence import SequenceStep
+
+_LOGGER: Final = logging.getLogger(__name__)
+
+TIERS_SCHEMA = vol.Schema({vol.All(vol.Coerce(int), vol.Range(min=1, max=NUM_TIERS)): vol.In(list(COLOR_MAP))})
+
+STEP_SCHEMA = vol.Schema({
+    vol.Optional(ATTR_TIERS, default={}): TIERS_SCHEMA,
+    vol.Optional(ATTR_FLASH, default=False): cv.boolean,
+    vol.Optional(ATTR_BUZZER, default=0): vol.All(vol.Coerce(int), vol.Range(min=0x00, max=0x0B)),
+    vol.Required(ATTR_DURATION): vol.All(vol.Coerce(float), vol.Range(min=0.05)),
+})
+
+PLAY_SEQUENCE_SCHEMA = vol.Schema({
+    vol.Required(ATTR_DEVICE_ID): vol.All(cv.ensure_list, [cv.string]),
+    vol.Required(ATTR_STEPS): vol.All(cv.ensure_list, [STEP_SCHEMA], vol.Length(min=1)),
+    vol.Optional(ATTR_REPEAT, default=1): vol.All(vol.Coerce(int), vol.Range(min=0)),
+})
+
+STOP_SEQUENCE_SCHEMA = vol.Schema({
+    vol.Required(ATTR_DEVICE_ID): vol.All(cv.ensure_list, [cv.string]),
+    vol.Optional(ATTR_RESTORE, default=True): cv.boolean,
+})
+
+SET_STATE_SCHEMA = vol.All(
+    vol.Schema({
+        vol.Required(ATTR_DEVICE_ID): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(ATTR_TIERS): TIERS_SCHEMA,
+        vol.Optional(ATTR_FLASH): cv.boolean,
+        vol.Optional(ATTR_BUZZER): vol.All(vol.Coerce(int), vol.Range(min=0x00, max=0x0B)),
+    }),
+    cv.has_at_least_one_key(ATTR_TIERS, ATTR_FLASH, ATTR_BUZZER),
+)
+
+CLAIM_SCHEMA = vol.Schema({
+    vol.Required(ATTR_DEVICE_ID): vol.All(cv.ensure_list, [cv.string]),
+    vol.Required(ATTR_SOURCE): cv.string,
+    vol.Required(ATTR_PRIORITY): vol.Coerce(int),
+    vol.Optional(ATTR_TIERS, default={}): TIERS_SCHEMA,
+    vol.Optional(ATTR_FLASH): cv.boolean,
+    vol.Optional(ATTR_BUZZER): vol.All(vol.Coerce(int), vol.Range(min=0x00, max=0x0B)),
+    vol.Optional(ATTR_TTL): vol.All(vol.Coerce(float), vol.Range(min=0, min_included=False)),
+})
+
+RELEASE_SCHEMA = vol.Schema({
+    vol.Required(ATTR_DEVICE_ID): vol.All(cv.ensure_list, [cv.string]),
+    vol.Required(ATTR_SOURCE): cv.string,
+})
+
+SNAPSHOT_SCHEMA = vol.Schema({
+    vol.Required(ATTR_DEVICE_ID): vol.All(cv.ensure_list, [cv.string]),
+    vol.Optional(ATTR_SNAPSHOT_ID, default=DEFAULT_SNAPSHOT_ID): cv.string,
+})
+
+EXPORT_TRACE_SCHEMA = vol.Schema({
+    vol.Required(ATTR_DEVICE_ID): vol.All(cv.ensure_list, [cv.string]),
+    vol.Optional(ATTR_FORMAT, default="pcap"): vol.In(TRACE_FORMATS),
+})
+
+
+@callback
+def async_get_loaded_device(hass: HomeAssistant, device_id: str) -> PatliteTowerBase | None:
+    """Return the loaded tower or group behind an HA device id, if any."""
+    dev = dr.async_get(hass).async_get(device_id)
+    if dev is None:
+        return None
+    loaded = hass.data.get(DOMAIN, {})
+    for entry_id in dev.config_entries:
+        if entry_id in loaded:
+            return loaded[entry_id]["device"]
+    return None
+
+
+@callback
+def async_get_towers(hass: HomeAssistant, device_ids: list[str]) -> list[PatliteDevice]:
+    """Resolve HA device ids to loaded towers; a group device expands to its members."""
+    towers: dict[str, PatliteDevice] = {}
+    for device_id in device_ids:
+        obj = async_get_loaded_device(hass, device_id)
+        if obj is None:
+            raise ServiceValidationError(f"{device_id} is not a loaded Patlite device")
+        for tower in obj.members if isinstance(obj, PatliteGroup) else [obj]:
+            towers[tower.uid] = tower
+    return list(towers.values())
+
+
+def _build_steps(steps: list[dict]) -> list[SequenceStep]:
+    """Turn validated step dicts into ready-to-send frames (done once per call)."""
+    built = []
+    for step in steps:
+        colors = [0x00] * NUM_TIERS
+        for tier, option in step[ATTR_TIERS].items():
+            colors[tier - 1] = COLOR_MAP[option]
+        built.append(SequenceStep(build_frame(colors, step[ATTR_FLASH], step[ATTR_BUZZER]), step[ATTR_DURATION]))
+    return built
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the integration services (once, not per config entry)."""
+
+    async def _play_sequence(call: ServiceCall) -> None:
+        steps = _build_steps(call.data[ATTR_STEPS])
+        for tower in async_get_towers(hass, call.data[ATTR_DEVICE_ID]):
+            tower.play_sequence(steps, call.data[ATTR_REPEAT])
+
+    def _origin(call: ServiceCall) -> str:
+        return f"{DOMAIN}.{call.service} ({call.context.id})"
+
+    async def _stop_sequence(call: ServiceCall) -> None:
+        for tower in async_get_towers(hass, call.data[ATTR_DEVICE_ID]):
+            tower.note_origin(_origin(call))
+            tower.stop_sequence(restore=call.data[ATTR_RESTORE])
+
+    async def _set_state(call: ServiceCall) -> None:
+        tiers = {tier - 1: COLOR_MAP[option] for tier, option in call.data.get(ATTR_TIERS, {}).items()}
+        targets: dict[str, PatliteTowerBase] = {}
+        for device_id in call.data[ATTR_DEVICE_ID]:
+            obj = async_get_loaded_device(hass, device_id)
+            if obj is None:
+                raise ServiceValidationError(f"{device_id} is not a loaded Patlite device")
+            targets[obj.uid] = obj
+            obj.note_origin(_origin(call))
+        # One state change, one notify pass and one frame per tower, all sent together
+        await asyncio.gather(*(
+            obj.async_set_state(
+                tiers, flash=call.data.get(ATTR_FLASH), buzzer=call.data.get(ATTR_BUZZER), flush=True
+            )
+            for obj in targets.values()
+        ))
+
+    async def _claim(call: ServiceCall) -> None:
+        tiers = {tier - 1: COLOR_MAP[option] for tier, option in call.data[ATTR_TIERS].items()}
+        for tower in async_get_towers(hass, call.data[ATTR_DEVICE_ID]):
+            tower.claim(
+                call.data[ATTR_SOURCE],
+                call.data[ATTR_PRIORITY],
+                tiers,
+                flash=call.data.get(ATTR_FLASH),
+                buzzer=call.data.get(ATTR_BUZZER),
+                ttl=call.data.get(ATTR_TTL),
+            )
+
+    async def _release(call: ServiceCall) -> None:
+        for tower in async_get_towers(hass, call.data[ATTR_DEVICE_ID]):
+            tower.release(call.data[ATTR_SOURCE])
+
+    async def _snapshot(call: ServiceCall) -> None:
+        for tower in async_get_towers(hass, call.data[ATTR_DEVICE_ID]):
+            tower.snapshots[call.data[ATTR_SNAPSHOT_ID]] = tower.snapshot()
+
+    async def _restore_snapshot(call: ServiceCall) -> None:
+        snapshot_id = call.data[ATTR_SNAPSHOT_ID]
+        restores = []
+        for tower in async_get_towers(hass, call.data[ATTR_DEVICE_ID]):
+            state = tower.snapshots.get(snapshot_id)
+            if state is None:
+                _LOGGER.warning("No snapshot %r for %s", snapshot_id, tower.name)
+                continue
+            tower.note_origin(_origin(call))
+            restores.append(tower.async_restore_snapshot(state))
+        await asyncio.gather(*restores)
+
+    async def _export_trace(call: ServiceCall) -> ServiceResponse:
+        fmt = call.data[ATTR_FORMAT]
+        files: dict[str, str] = {}
+        for tower in async_get_towers(hass, call.data[ATTR_DEVICE_ID]):
+            if tower.trace is None:
+                raise ServiceValidationError(f"Frame tracing is off for {tower.name}; enable it in the options")
+            payload = tower.trace.to_pcap() if fmt == "pcap" else tower.trace.to_jsonl().encode()
+            path = hass.config.path(f"patlite_trace_{tower.host}_{tower.port}.{fmt}")
+            await hass.async_add_executor_job(_write_file, path, payload)
+            files[tower.name] = path
+        return {"files": files}
+
+    hass.services.async_register(DOMAIN, SERVICE_PLAY_SEQUENCE, _play_sequence, schema=PLAY_SEQUENCE_SCHEMA)
+    hass.services.async_register(DOMAIN, SERVICE_STOP_SEQUENCE, _stop_sequence, schema=STOP_SEQUENCE_SCHEMA)
+    hass.services.async_register(DOMAIN, SERVICE_SET_STATE, _set_state, schema=SET_STATE_SCHEMA)
+    hass.services.async_register(DOMAIN, SERVICE_CLAIM, _claim, schema=CLAIM_SCHEMA)
+    hass.services.async_register(DOMAIN, SERVICE_RELEASE, _release, schema=RELEASE_SCHEMA)
+    hass.services.async_register(DOMAIN, SERVICE_SNAPSHOT, _snapshot, schema=SNAPSHOT_SCHEMA)
+    hass.services.async_register(DOMAIN, SERVICE_RESTORE_SNAPSHOT, _restore_snapshot, schema=SNAPSHOT_SCHEMA)
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_EXPORT_TRACE,
+        _export_trace,
+        schema=EXPORT_TRACE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+
+def _write_file(path: str, payload: bytes) -> None:
+    with open(path, "wb") as fh:
+        fh.write(payload)
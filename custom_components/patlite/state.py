@@ -0,0 +1,111 @@
+from __future__ import annotations
+from typing import Final
+
+from .const import NUM_TIERS, DEFAULT_ON_COLOR
+
+# Bit layout of TowerState._packed, per tier (tier n starts at bit n * _TIER_BITS):
+#   0..7  colour code, 8 enabled, 9..16 last non-zero colour (0 = none yet)
+# followed by the flash bit and the 4-bit buzzer pattern.
+_TIER_BITS: Final = 17
+_TIER_MASK: Final = (1 << _TIER_BITS) - 1
+_ENABLED: Final = 1 << 8
+_LAST_SHIFT: Final = 9
+_FLASH_SHIFT: Final = NUM_TIERS * _TIER_BITS
+_BUZZER_SHIFT: Final = _FLASH_SHIFT + 1
+
+
+class TowerState:
+    """Immutable, hashable state of one tower, packed into a single int.
+
+    Holds what the entities show: per tier the colour, power and last
+    non-zero colour, plus flash and buzzer pattern. Copying, comparing and
+    hashing cost the same as for one int, so a snapshot is just a reference.
+    """
+
+    __slots__ = ("_packed",)
+
+    def __init__(self, packed: int = 0):
+        object.__setattr__(self, "_packed", packed)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("TowerState is immutable")
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, TowerState) and other._packed == self._packed
+
+    def __hash__(self) -> int:
+        return hash(self._packed)
+
+    def __repr__(self) -> str:
+        return f"TowerState(data={self.data().hex()}, packed={self._packed:#x})"
+
+    @classmethod
+    def from_data(cls, data: bytes | bytearray, previous: TowerState | None = None) -> TowerState:
+        """State a tower reports (7 data bytes); last colours carry over from ``previous``."""
+        state = previous if previous is not None else cls()
+        for tier in range(NUM_TIERS):
+            code = data[tier]
+            state = state.with_tier(tier, code, code != 0x00, code or None)
+        return state.with_flash(data[NUM_TIERS] & 0x01).with_buzzer(data[NUM_TIERS + 1])
+
+    # ---------- Fields ----------
+    def _tier(self, tier: int) -> int:
+        return (self._packed >> (tier * _TIER_BITS)) & _TIER_MASK
+
+    def color(self, tier: int) -> int:
+        return self._tier(tier) & 0xFF
+
+    def enabled(self, tier: int) -> bool:
+        return bool(self._tier(tier) & _ENABLED)
+
+    def last_color(self, tier: int) -> int | None:
+        return (self._tier(tier) >> _LAST_SHIFT) or None
+
+    def tier_bits(self, tier: int) -> int:
+        """Everything about one tier as an int: compares equal iff the tier is unchanged."""
+        return self._tier(tier)
+
+    @property
+    def flash(self) -> int:
+        return (self._packed >> _FLASH_SHIFT) & 0x1
+
+    @property
+    def buzzer(self) -> int:
+        return (self._packed >> _BUZZER_SHIFT) & 0xF
+
+    def tier_code(self, tier: int) -> int:
+        """Colour code this tier shows on the tower (an 'on' tier is never 0x00)."""
+        bits = self._tier(tier)
+        code = bits & 0xFF
+        if bits & _ENABLED and code == 0x00:
+            code = (bits >> _LAST_SHIFT) or DEFAULT_ON_COLOR
+        return code
+
+    def data(self) -> bytes:
+        """The 7 data bytes of the 'Detailed Motion Control' frame for this state."""
+        return bytes([self.tier_code(t) for t in range(NUM_TIERS)] + [self.flash, self.buzzer])
+
+    # ---------- Derived states ----------
+    def with_tier(
+        self,
+        tier: int,
+        color: int | None = None,
+        enabled: bool | None = None,
+        last_color: int | None = None,
+    ) -> TowerState:
+        """Copy with the given parts of one tier changed (None = keep)."""
+        bits = self._tier(tier)
+        if color is not None:
+            bits = (bits & ~0xFF) | color
+        if enabled is not None:
+            bits = bits | _ENABLED if enabled else bits & ~_ENABLED
+        if last_color:
+            bits = (bits & ((1 << _LAST_SHIFT) - 1)) | (last_color << _LAST_SHIFT)
+        shift = tier * _TIER_BITS
+        return TowerState((self._packed & ~(_TIER_MASK << shift)) | (bits << shift))
+
+    def with_flash(self, flash: int | bool) -> TowerState:
+        return TowerState((self._packed & ~(1 << _FLASH_SHIFT)) | ((1 if flash else 0) << _FLASH_SHIFT))
+
+    def with_buzzer(self, buzzer: int) -> TowerState:
+        return TowerState((self._packed & ~(0xF << _BUZZER_SHIFT)) | (buzzer << _BUZZER_SHIFT))
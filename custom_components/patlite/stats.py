@@ -0,0 +1,126 @@
+from __future__ import annotations
+import time
+from bisect import bisect_left
+from typing import Any, Final
+
+# Upper bounds (ms) of the round-trip latency buckets; the last bucket is open-ended
+LATENCY_BUCKETS_MS: Final = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000)
+
+
+class LatencyHistogram:
+    """Fixed-bucket histogram, cheap enough to update on every reply."""
+
+    __slots__ = ("counts", "count", "sum_ms", "max_ms")
+
+    def __init__(self):
+        self.counts: list[int] = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.count = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, ms: float) -> None:
+        self.counts[bisect_left(LATENCY_BUCKETS_MS, ms)] += 1
+        self.count += 1
+        self.sum_ms += ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+
+    def percentile(self, pct: float, since: list[int] | None = None) -> float | None:
+        """Upper bound (ms) of the bucket holding the ``pct`` percentile.
+
+        With ``since`` (an earlier copy of ``counts``) only observations made
+        after it count, which gives the percentile over a time window.
+        """
+        counts = self.counts if since is None else [c - s for c, s in zip(self.counts, since)]
+        total = sum(counts)
+        if not total:
+            return None
+        rank = pct / 100 * total
+        running = 0
+        for bound, count in zip(LATENCY_BUCKETS_MS, counts):
+            running += count
+            if running >= rank:
+                return float(bound)
+        return self.max_ms  # open-ended last bucket
+
+    def as_dict(self) -> dict[str, Any]:
+        buckets = {f"le_{b}ms": c for b, c in zip(LATENCY_BUCKETS_MS, self.counts)}
+        buckets[f"gt_{LATENCY_BUCKETS_MS[-1]}ms"] = self.counts[-1]
+        return {
+            "count": self.count,
+            "mean_ms": round(self.sum_ms / self.count, 3) if self.count else None,
+            "max_ms": round(self.max_ms, 3),
+            "buckets": buckets,
+        }
+
+
+class DeliveryStats:
+    """Per-device counters for the ACK-aware send path."""
+
+    __slots__ = (
+        "commands", "coalesced", "sent", "acked", "nacked", "retried", "timed_out",
+        "throttled", "suppressed", "last_ack", "latency",
+    )
+
+    def __init__(self):
+        self.commands = 0  # local state changes (entity commands, services, ...)
+        self.coalesced = 0  # changes that rode along in an already pending frame
+        self.sent = 0  # datagrams put on the wire, retries included
+        self.acked = 0
+        self.nacked = 0
+        self.retried = 0
+        self.timed_out = 0  # commands that got no reply after all retries
+        self.throttled = 0  # frames that had to wait for the rate limiter
+        self.suppressed = 0  # frames replaced by a newer one while waiting, never sent
+        self.last_ack: float | None = None  # monotonic time of the last ACK
+        self.latency = LatencyHistogram()
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "commands": self.commands,
+            "coalesced": self.coalesced,
+            "sent": self.sent,
+            "acked": self.acked,
+            "nacked": self.nacked,
+            "retried": self.retried,
+            "timed_out": self.timed_out,
+            "throttled": self.throttled,
+            "suppressed": self.suppressed,
+            "latency": self.latency.as_dict(),
+        }
+
+
+class StatsWindow:
+    """Turn cumulative counters into figures for the time since the previous sample.
+
+    Sensors sample on a fixed interval; rates and percentiles then describe
+    that interval instead of everything since startup.
+    """
+
+    def __init__(self):
+        self._stamp = time.monotonic()
+        self._commands = 0
+        self._latency: list[int] = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self._fanout_count = 0
+        self._fanout_sum = 0.0
+
+    def sample(self, stats: DeliveryStats, fanout: LatencyHistogram) -> dict[str, Any]:
+        now = time.monotonic()
+        elapsed = now - self._stamp
+        fanout_count = fanout.count - self._fanout_count
+        data = {
+            "commands_per_s": round((stats.commands - self._commands) / elapsed, 2) if elapsed > 0 else 0.0,
+            "latency_p50_ms": stats.latency.percentile(50, self._latency),
+            "latency_p99_ms": stats.latency.percentile(99, self._latency),
+            "timeouts": stats.timed_out,
+            "coalesced": stats.coalesced,
+            "suppressed": stats.suppressed,
+            "last_ack_age_s": round(now - stats.last_ack, 1) if stats.last_ack is not None else None,
+            "fanout_ms": round((fanout.sum_ms - self._fanout_sum) / fanout_count, 3) if fanout_count else None,
+        }
+        self._stamp = now
+        self._commands = stats.commands
+        self._latency = list(stats.latency.counts)
+        self._fanout_count = fanout.count
+        self._fanout_sum = fanout.sum_ms
+        return data
@@ -1,84 +1,77 @@
 from __future__ import annotations
-from typing import Any, Callable
+from typing import Any
 
 from homeassistant.components.switch import SwitchEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.restore_state import RestoredExtraData
 
 from .const import DOMAIN
-from .device import PatliteDevice
+from .device import PatliteTowerBase, KEY_FLASH, KEY_BUZZER
+from .entity import PatliteEntity
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback) -> None:
-    device: PatliteDevice = hass.data[DOMAIN][entry.entry_id]["device"]
+    device: PatliteTowerBase = hass.data[DOMAIN][entry.entry_id]["device"]
     async_add_entities([PatliteFlashSwitch(device), PatliteBuzzerSwitch(device)])
 
 
-class _BaseSwitch(SwitchEntity):
-    def __init__(self, device: PatliteDevice, name: str, key: str):
-        self._device = device
+class _BaseSwitch(PatliteEntity, SwitchEntity):
+    def __init__(self, device: PatliteTowerBase, name: str, key: str):
+        super().__init__(device, key)
         self._attr_name = name
-        self._attr_unique_id = f"{device.host}:{device.port}-{key}"
-        self._attr_should_poll = False
-        self._unsub: Callable[[], None] | None = None
-
-    async def async_added_to_hass(self) -> None:
-        self._unsub = self._device.add_listener(self._device_updated)
-
-    async def async_will_remove_from_hass(self) -> None:
-        if self._unsub:
-            self._unsub()
-            self._unsub = None
-
-    def _device_updated(self) -> None:
-        self.schedule_update_ha_state()
-
-    @property
-    def available(self) -> bool:
-        return True
-
-    @property
-    def device_info(self):
-        return {
-            "identifiers": {(DOMAIN, f"{self._device.host}:{self._device.port}")},
-            "manufacturer": "Patlite",
-            "name": f"Patlite @ {self._device.host}",
-            "model": "UDP Tower",
-        }
+        self._attr_unique_id = f"{device.uid}-{key}"
 
 
 class PatliteFlashSwitch(_BaseSwitch):
     _attr_icon = "mdi:alarm-light-outline"
-    def __init__(self, device: PatliteDevice):
-        super().__init__(device, "Patlite Flash", "flash")
+    def __init__(self, device: PatliteTowerBase):
+        super().__init__(device, f"{device.name_prefix} Flash", KEY_FLASH)
 
     @property
     def is_on(self) -> bool:
         return bool(self._device.flash)
 
+    @property
+    def extra_restore_state_data(self) -> RestoredExtraData:
+        return RestoredExtraData({"flash": self._device.flash})
+
+    def _restore(self, data: dict[str, Any]) -> None:
+        if data.get("flash") is not None:
+            self._device.restore(flash=data["flash"])
+
     async def async_turn_on(self, **kwargs: Any) -> None:
-        self._device.set_flash(1)
-        self.async_write_ha_state()
+        self._note_origin()
+        await self._device.async_set_flash(1)
 
     async def async_turn_off(self, **kwargs: Any) -> None:
-        self._device.set_flash(0)
-        self.async_write_ha_state()
+        self._note_origin()
+        await self._device.async_set_flash(0)
 
 
 class PatliteBuzzerSwitch(_BaseSwitch):
     _attr_icon = "mdi:volume-high"
-    def __init__(self, device: PatliteDevice):
-        super().__init__(device, "Patlite Buzzer", "buzzer")
+    def __init__(self, device: PatliteTowerBase):
+        super().__init__(device, f"{device.name_prefix} Buzzer", KEY_BUZZER)
 
     @property
     def is_on(self) -> bool:
         return bool(self._device.buzzer)
 
+    @property
+    def extra_restore_state_data(self) -> RestoredExtraData:
+        # The pattern, not just on/off, so a restart does not turn pattern 5 into 1
+        return RestoredExtraData({"buzzer": self._device.buzzer})
+
+    def _restore(self, data: dict[str, Any]) -> None:
+        if isinstance(data.get("buzzer"), int) and 0x00 <= data["buzzer"] <= 0x0B:
+            self._device.restore(buzzer=data["buzzer"])
+
     async def async_turn_on(self, **kwargs: Any) -> None:
-        self._device.set_buzzer(1)
-        self.async_write_ha_state()
+        self._note_origin()
+        await self._device.async_set_buzzer(1)
 
     async def async_turn_off(self, **kwargs: Any) -> None:
-        self._device.set_buzzer(0)
-        self.async_write_ha_state()
+        self._note_origin()
+        await self._device.async_set_buzzer(0)
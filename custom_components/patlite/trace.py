@@ -0,0 +1,84 @@
+from __future__ import annotations
+import ipaddress
+import json
+import struct
+import time
+from collections import deque
+from typing import Any, Final
+
+TX: Final = "tx"
+RX: Final = "rx"
+
+# pcap: classic format, raw IPv4 link type so Wireshark decodes the (synthesised) UDP headers
+_PCAP_HEADER: Final = struct.pack("<IHHiIII", 0xA1B2C3D4, 2, 4, 0, 0, 65535, 101)
+_PCAP_RECORD: Final = struct.Struct("<IIII")
+_UDP_HEADER: Final = struct.Struct("!HHHH")
+_IP_HEADER: Final = struct.Struct("!BBHHHBBH4s4s")
+_LOCAL_PORT: Final = 50000  # placeholder; the real source port is not recorded
+
+
+class FrameTrace:
+    """Bounded ring buffer of every frame sent to and received from one tower.
+
+    Entries are plain tuples appended to a deque, so recording costs about as
+    much as a list append; devices keep ``trace = None`` when tracing is off.
+    """
+
+    __slots__ = ("host", "port", "_entries")
+
+    def __init__(self, host: str, port: int, size: int):
+        self.host = host
+        self.port = port
+        self._entries: deque[tuple[float, str, bytes, str | None]] = deque(maxlen=size)
+
+    def record(self, direction: str, data: bytes, origin: str | None = None) -> None:
+        self._entries.append((time.monotonic(), direction, data, origin))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def as_list(self) -> list[dict[str, Any]]:
+        """Entries oldest first, with wall-clock times, for diagnostics and JSONL."""
+        offset = time.time() - time.monotonic()
+        return [
+            {
+                "t": round(t, 6),
+                "time": round(t + offset, 6),
+                "dir": direction,
+                "data": data.hex(),
+                "origin": origin,
+            }
+            for t, direction, data, origin in self._entries
+        ]
+
+    def to_jsonl(self) -> str:
+        return "".join(json.dumps(entry) + "\n" for entry in self.as_list())
+
+    def to_pcap(self) -> bytes:
+        """The trace as a pcap file, each frame wrapped in IPv4/UDP headers."""
+        offset = time.time() - time.monotonic()
+        try:
+            tower = ipaddress.IPv4Address(self.host).packed
+        except ValueError:
+            tower = bytes(4)  # hostname: address unknown here
+        local = bytes(4)
+        out = [_PCAP_HEADER]
+        for t, direction, data, _origin in self._entries:
+            if direction == TX:
+                src, dst, sport, dport = local, tower, _LOCAL_PORT, self.port
+            else:
+                src, dst, sport, dport = tower, local, self.port, _LOCAL_PORT
+            udp = _UDP_HEADER.pack(sport, dport, 8 + len(data), 0) + data
+            ip = _ip_header(src, dst, len(udp)) + udp
+            wall = t + offset
+            out.append(_PCAP_RECORD.pack(int(wall), int(wall % 1 * 1_000_000), len(ip), len(ip)))
+            out.append(ip)
+        return b"".join(out)
+
+
+def _ip_header(src: bytes, dst: bytes, payload_len: int) -> bytes:
+    header = _IP_HEADER.pack(0x45, 0, 20 + payload_len, 0, 0, 64, 17, 0, src, dst)
+    total = sum(struct.unpack("!10H", header))
+    while total >> 16:
+        total = (total & 0xFFFF) + (total >> 16)
+    return header[:10] + struct.pack("!H", ~total & 0xFFFF) + header[12:]
@@ -0,0 +1,207 @@
+from __future__ import annotations
+import asyncio
+import logging
+import socket
+import time
+from typing import Final, Callable
+
+from .const import (
+    TCP_CONNECT_TIMEOUT_S,
+    TCP_RECONNECT_BACKOFF_S,
+    TCP_RECONNECT_BACKOFF_MAX_S,
+    TCP_KEEPALIVE_IDLE_S,
+    TCP_KEEPALIVE_INTERVAL_S,
+    TCP_KEEPALIVE_COUNT,
+)
+
+_LOGGER: Final = logging.getLogger(__name__)
+
+
+class _PnsDatagramProtocol(asyncio.DatagramProtocol):
+    """Forward socket events to the owning PnsUdpTransport."""
+
+    def __init__(self, owner: PnsUdpTransport):
+        self._owner = owner
+        self._transport: asyncio.BaseTransport | None = None
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        self._transport = transport
+
+    def datagram_received(self, data: bytes, addr) -> None:
+        self._owner._datagram_received(data)
+
+    def error_received(self, exc: Exception) -> None:
+        # ICMP port unreachable etc.; UDP keeps going, so just log it
+        _LOGGER.debug("UDP error from %s:%s: %s", self._owner.host, self._owner.port, exc)
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        self._owner._connection_lost(self._transport, exc)
+
+
+class PnsUdpTransport:
+    """One long-lived, connected UDP socket per tower.
+
+    The socket is opened once (address resolution happens off the event loop)
+    and every frame afterwards is a single non-blocking ``sendto``.
+    """
+
+    stream = False  # each datagram is one whole reply
+
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self.on_receive: Callable[[bytes], None] | None = None
+        self._transport: asyncio.DatagramTransport | None = None
+
+    @property
+    def connected(self) -> bool:
+        return self._transport is not None and not self._transport.is_closing()
+
+    async def async_open(self) -> None:
+        """Open the socket if it is not open already. Raises OSError on failure."""
+        if self.connected:
+            return
+        loop = asyncio.get_running_loop()
+        self._transport, _ = await loop.create_datagram_endpoint(
+            lambda: _PnsDatagramProtocol(self),
+            remote_addr=(self.host, self.port),
+        )
+        _LOGGER.debug("UDP transport open to %s:%s", self.host, self.port)
+
+    def send(self, data: bytes) -> bool:
+        """Queue one datagram. Returns False if the socket is not open."""
+        if not self.connected:
+            return False
+        self._transport.sendto(data)
+        return True
+
+    def close(self) -> None:
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
+
+    # ---------- Protocol callbacks ----------
+    def _datagram_received(self, data: bytes) -> None:
+        if self.on_receive is not None:
+            self.on_receive(data)
+
+    def _connection_lost(self, transport: asyncio.BaseTransport | None, exc: Exception | None) -> None:
+        if exc is not None:
+            _LOGGER.debug("UDP transport to %s:%s lost: %s", self.host, self.port, exc)
+        # Ignore late callbacks from a socket we already replaced
+        if transport is self._transport:
+            self._transport = None
+
+
+class _PnsStreamProtocol(asyncio.Protocol):
+    """Forward socket events to the owning PnsTcpTransport."""
+
+    def __init__(self, owner: PnsTcpTransport):
+        self._owner = owner
+        self._transport: asyncio.BaseTransport | None = None
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        self._transport = transport
+
+    def data_received(self, data: bytes) -> None:
+        self._owner._data_received(data)
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        self._owner._connection_lost(self._transport, exc)
+
+
+class PnsTcpTransport:
+    """One persistent, keep-alive TCP connection per tower.
+
+    Same interface as PnsUdpTransport. The connection is reused for every
+    command; after a failed connect further attempts are refused until the
+    reconnect backoff has passed, so a dead tower costs one connect per
+    backoff period instead of one per command.
+    """
+
+    stream = True  # replies arrive as a byte stream and may be split or merged
+
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self.on_receive: Callable[[bytes], None] | None = None
+        self.on_lost: Callable[[], None] | None = None
+        self._transport: asyncio.Transport | None = None
+        self._backoff = 0.0
+        self._retry_at = 0.0  # monotonic time before which we do not reconnect
+
+    @property
+    def connected(self) -> bool:
+        return self._transport is not None and not self._transport.is_closing()
+
+    async def async_open(self) -> None:
+        """Connect if not connected already. Raises OSError on failure."""
+        if self.connected:
+            return
+        now = time.monotonic()
+        if now < self._retry_at:
+            raise OSError(
+                f"Reconnect to {self.host}:{self.port} backing off for {self._retry_at - now:.1f}s"
+            )
+        loop = asyncio.get_running_loop()
+        try:
+            transport, _ = await asyncio.wait_for(
+                loop.create_connection(lambda: _PnsStreamProtocol(self), self.host, self.port),
+                TCP_CONNECT_TIMEOUT_S,
+            )
+        except (OSError, asyncio.TimeoutError) as exc:
+            self._backoff = min(max(self._backoff * 2, TCP_RECONNECT_BACKOFF_S), TCP_RECONNECT_BACKOFF_MAX_S)
+            self._retry_at = time.monotonic() + self._backoff
+            raise OSError(f"Cannot connect to {self.host}:{self.port}: {exc or 'timeout'}") from exc
+        self._backoff = 0.0
+        self._retry_at = 0.0
+        _set_keepalive(transport.get_extra_info("socket"))
+        self._transport = transport
+        _LOGGER.debug("TCP connection open to %s:%s", self.host, self.port)
+
+    def send(self, data: bytes) -> bool:
+        """Queue bytes on the connection. Returns False if it is not open."""
+        if not self.connected:
+            return False
+        self._transport.write(data)
+        return True
+
+    def reset(self) -> None:
+        """Drop a connection that stopped answering (half-open); the next open reconnects."""
+        if self._transport is not None:
+            _LOGGER.debug("Resetting silent TCP connection to %s:%s", self.host, self.port)
+            self._transport.abort()
+            self._transport = None
+
+    def close(self) -> None:
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
+
+    # ---------- Protocol callbacks ----------
+    def _data_received(self, data: bytes) -> None:
+        if self.on_receive is not None:
+            self.on_receive(data)
+
+    def _connection_lost(self, transport: asyncio.BaseTransport | None, exc: Exception | None) -> None:
+        if transport is not self._transport:
+            return
+        _LOGGER.debug("TCP connection to %s:%s lost: %s", self.host, self.port, exc or "closed by peer")
+        self._transport = None
+        if self.on_lost is not None:
+            self.on_lost()
+
+
+def _set_keepalive(sock: socket.socket | None) -> None:
+    if sock is None:
+        return
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    # Tighter than the 2 h OS default, where the platform lets us tune it
+    for name, value in (
+        ("TCP_KEEPIDLE", TCP_KEEPALIVE_IDLE_S),
+        ("TCP_KEEPINTVL", TCP_KEEPALIVE_INTERVAL_S),
+        ("TCP_KEEPCNT", TCP_KEEPALIVE_COUNT),
+    ):
+        option = getattr(socket, name, None)
+        if option is not None:
+            sock.setsockopt(socket.IPPROTO_TCP, option, value)